@@ -5,7 +5,6 @@ import os
 import pubnub
 
 from vivintpy.account import Account
-from vivintpy.devices import VivintDevice
 from vivintpy.devices.camera import MOTION_DETECTED, Camera
 from vivintpy.exceptions import VivintSkyApiMfaRequiredError
 
@@ -16,9 +15,6 @@ async def main():
     logging.getLogger().setLevel(logging.DEBUG)
     logging.debug("Demo started")
 
-    def camera_motion_callback(device: VivintDevice) -> None:
-        logging.debug("Motion detected from camera: %s", device)
-
     account = Account(username=os.environ["username"], password=os.environ["password"])
     try:
         await account.connect(load_devices=True, subscribe_for_realtime_updates=True)
@@ -36,12 +32,15 @@ async def main():
             )
             for device in alarm_panel.devices:
                 logging.debug(f"\t\t\tDevice: {device}")
-                if isinstance(device, Camera):
-                    device.on(
-                        MOTION_DETECTED,
-                        lambda event: camera_motion_callback(event["device"]),
-                    )
 
+    async def log_camera_motion() -> None:
+        async with account.events(
+            types={MOTION_DETECTED}, device_types={Camera}
+        ) as events:
+            async for event in events:
+                logging.debug("Motion detected from camera: %s", event.device)
+
+    motion_task = asyncio.create_task(log_camera_motion())
     try:
         while True:
             await asyncio.sleep(300)
@@ -49,6 +48,7 @@ async def main():
     except Exception as e:
         logging.debug(e)
     finally:
+        motion_task.cancel()
         await account.disconnect()
 
 
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Run micro-benchmarks for performance sensitive code paths.
+
+Usage: python3 -m script.benchmark [name ...]
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+import timeit
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import jwt
+
+from vivintpy import codec, zjs_device_config_db
+from vivintpy.api import VivintSkyApi
+from vivintpy.devices.alarm_panel import AlarmPanel
+from vivintpy.utils import first_or_none
+
+BENCHMARKS: dict[str, Callable[[], None]] = {}
+
+
+def benchmark(func: Callable[[], None]) -> Callable[[], None]:
+    """Register a benchmark."""
+    BENCHMARKS[func.__name__.removeprefix("bench_")] = func
+    return func
+
+
+def _report(label: str, func: Callable[[], object], number: int) -> float:
+    """Time `func` and print the per-call duration in microseconds."""
+    per_call = min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+    print(f"  {label:<40} {per_call:10.3f} µs/call")
+    return per_call
+
+
+@benchmark
+def bench_session_validity() -> None:
+    """Compare decoding the id token per request with the cached deadline."""
+    token = {
+        "id_token": jwt.encode(
+            {"exp": int(time.time() + 3600), "sub": "user", "email": "a@b.c"},
+            "a-secret-key-that-is-long-enough-for-hs256",
+        ),
+        "access_token": "access",
+    }
+    api = VivintSkyApi("username", "password", client_session=object())  # type: ignore[arg-type]
+    api._VivintSkyApi__set_token(token)  # type: ignore[attr-defined] # pylint: disable=protected-access
+
+    def _decode() -> None:
+        jwt.decode(
+            token["id_token"],
+            options={"verify_signature": False, "verify_exp": True},
+            leeway=-30,
+        )
+
+    before = _report("jwt.decode per request (before)", _decode, 10_000)
+    after = _report("is_session_valid (after)", api.is_session_valid, 100_000)
+    print(f"  speedup: {before / after:.0f}x")
+
+
+def _system_payload(device_count: int) -> dict:
+    """Return a synthetic `systems/{panel_id}` payload with `device_count` devices."""
+    devices = [
+        {
+            "_id": device_id,
+            "panid": 1234567890,
+            "t": "wireless_sensor",
+            "n": f"Sensor {device_id}",
+            "s": device_id % 2 == 0,
+            "b": 0,
+            "ser32": 10_000_000 + device_id,
+            "ec": 1251,
+            "set": 1,
+            "sent": 10,
+            "csv": "1.2.3",
+            "fwv": [[1, 2], [3, 4]],
+            "caca": [{"t": 1, "ca": [1, 2, 3, 4, 5]}, {"t": 2, "ca": [6, 7]}],
+            "fea": {"f1": True, "f2": False, "f3": True},
+            "zpd": {"nodeId": device_id, "secure": True, "listening": False},
+            "manid": 0x0086,
+            "prtid": 0x0003,
+            "prid": device_id,
+            "lb": False,
+            "bl": 100,
+            "on": True,
+        }
+        for device_id in range(1, device_count + 1)
+    ]
+    return {
+        "system": {
+            "panid": 1234567890,
+            "fea": {"name": "Home", "admin": True},
+            "par": [
+                {"panid": 1234567890, "parid": 1, "s": 0, "d": devices, "ureg": []}
+            ],
+            "u": [{"_id": i, "n": f"User {i}", "ad": i == 0} for i in range(10)],
+        }
+    }
+
+
+@benchmark
+def bench_json() -> None:
+    """Compare the stdlib json module with the selected codec on system payloads."""
+    print(f"  selected codec: {codec.JSON_CODEC}")
+    for device_count in (50, 250, 1000):
+        payload = _system_payload(device_count)
+        body = json.dumps(payload).encode()
+        print(f"  {device_count} devices ({len(body) / 1024:.0f} KB):")
+        before = _report("json.loads (before)", lambda body=body: json.loads(body), 20)
+        after = _report(
+            f"{codec.JSON_CODEC} loads (after)",
+            lambda body=body: codec.json_loads(body),
+            20,
+        )
+        print(f"  speedup: {before / after:.1f}x")
+
+
+def _measure_in_subprocess(code: str) -> tuple[float, float]:
+    """Run `code` in a fresh interpreter, returning its duration (ms) and memory (KB).
+
+    Memory is what the Python heap retains afterwards, per `tracemalloc`.
+    """
+    script = (
+        "import time, tracemalloc\n"
+        "tracemalloc.start()\n"
+        "start = time.perf_counter()\n"
+        f"{code}\n"
+        "duration = (time.perf_counter() - start) * 1000\n"
+        "print(duration, tracemalloc.get_traced_memory()[0] / 1024)\n"
+    )
+    runs = [
+        subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, check=True, text=True
+        ).stdout.split()
+        for _ in range(5)
+    ]
+    return min(float(run[0]) for run in runs), min(float(run[1]) for run in runs)
+
+
+@benchmark
+def bench_zwave_db() -> None:
+    """Compare loading the Z-Wave JSON db with the lazy memory-mapped index."""
+    for label, code in (
+        (
+            "json.load at import (before)",
+            (
+                "import json, vivintpy.zjs_device_config_db as db\n"
+                "with open(db.ZJS_DEVICE_CONFIG_DB_FILE) as file: DB = json.load(file)"
+            ),
+        ),
+        (
+            "lazy index import (after)",
+            "import vivintpy.zjs_device_config_db",
+        ),
+        (
+            "lazy index first lookup (after)",
+            (
+                "from vivintpy.zjs_device_config_db import get_zwave_device_info\n"
+                "get_zwave_device_info(0x0129, 0x8107, 0x49D1)"
+            ),
+        ),
+    ):
+        duration, memory = _measure_in_subprocess(code)
+        print(f"  {label:<40} {duration:8.2f} ms {memory:8.0f} KB retained")
+
+
+@benchmark
+def bench_zwave_lookup() -> None:
+    """Compare string-keyed lookups with memoized integer-keyed ones for a fleet."""
+    # 5000 devices of 50 models, half of which are unknown
+    models = [(0x0129, 0x8107, 0x49D1), (0x0086, 0x0003, 0x0062)] * 13 + [
+        (0xFFFF, 0xFFFF, product_id) for product_id in range(24)
+    ]
+    fleet = models * 100
+    device_db = zjs_device_config_db._load_json_db()  # pylint: disable=protected-access
+
+    def _before() -> None:
+        for manufacturer_id, product_type, product_id in fleet:
+            key = f"0x{manufacturer_id:04x}:0x{product_type:04x}:0x{product_id:04x}"
+            device_db.get(key)
+
+    def _after() -> None:
+        for device in fleet:
+            zjs_device_config_db.get_zwave_device_info(*device)
+
+    before = _report("string keyed dict lookup (before)", _before, 10)
+    after = _report("memoized integer lookup (after)", _after, 10)
+    print(f"  speedup: {before / after:.1f}x")
+
+
+@benchmark
+def bench_pubnub_dispatch() -> None:
+    """Measure device message throughput against the number of panel devices."""
+    for device_count in (10, 50, 150, 500):
+        data = _system_payload(device_count)["system"]["par"][0]
+        panel = AlarmPanel(data, SimpleNamespace(name="Home", dispatcher=None))  # type: ignore[arg-type]
+        messages = [
+            {"op": "u", "da": {"d": [{"_id": device_id, "s": True}]}}
+            for device_id in range(1, device_count + 1)
+        ]
+
+        def _scan(panel: AlarmPanel = panel, messages: list = messages) -> None:
+            # the two linear scans each message used to make
+            for message in messages:
+                device_id = message["da"]["d"][0]["_id"]
+                first_or_none(panel.devices, lambda d, i=device_id: d.id == i)  # type: ignore
+                first_or_none(panel.data["d"], lambda d, i=device_id: d["_id"] == i)  # type: ignore
+
+        def _dispatch(panel: AlarmPanel = panel, messages: list = messages) -> None:
+            for message in messages:
+                panel.handle_pubnub_message(message)
+
+        print(f"  {device_count} devices:")
+        scan = _report("device lookups by linear scan (before)", _scan, 10)
+        dispatch = _report("handle_pubnub_message (after)", _dispatch, 10)
+        print(
+            f"  {device_count * 1e6 / dispatch:,.0f} messages/s, "
+            f"{scan / device_count:.2f} µs/message of lookups removed"
+        )
+
+
+def main(names: list[str]) -> int:
+    """Run the requested benchmarks, or all of them."""
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark {name}, choose from: {', '.join(BENCHMARKS)}")
+            return 1
+        print(f"{name}:")
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
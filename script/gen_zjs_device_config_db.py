@@ -2,6 +2,7 @@
 """Generate an updated zjs_device_config_db.json."""
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
@@ -9,14 +10,13 @@ import re
 import shutil
 import sys
 import tarfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any, Generator
 
 import aiohttp
 
-logging.getLogger("vivintpy.zjs_device_config_db").setLevel(logging.DEBUG)
-logging.getLogger().setLevel(logging.DEBUG)
+from vivintpy.zjs_device_config_db import ZJS_DEVICE_INDEX_FILE, build_device_index
 
 UPDATED_AT = "updated_at"
 TMP_DIR = os.path.join(os.path.dirname(__file__), "./.tmp/")
@@ -26,6 +26,13 @@ ZJS_TAR_CONFIG_BASE = "/packages/config/config/"
 ZJS_DEVICE_CONFIG_DB_FILE = os.path.join(
     os.path.dirname(__file__), "../vivintpy/zjs_device_config_db.json"
 )
+# content hashes and parsed devices of the config files, to skip unchanged ones
+ZJS_MANIFEST_FILE = os.path.join(os.path.dirname(__file__), ".zjs_manifest.json")
+
+LINE_COMMENT_PATTERN = re.compile(r"((^|[^\S\n]+)//.*)|(/\*.*\*/)", re.MULTILINE)
+BLOCK_COMMENT_PATTERN = re.compile(r"(?m)^\s*?/\*(.|\n)*?\*/\s*?$")
+# config files sent to each worker at a time
+PARSE_CHUNK_SIZE = 64
 
 
 def _clean_temp_directory(create: bool = False) -> None:
@@ -39,42 +46,108 @@ def _clean_temp_directory(create: bool = False) -> None:
         os.mkdir(TMP_DIR)
 
 
-def _create_db_from_zjs_config_files(
-    updated_at: str,
-) -> dict[str, str | dict[str, str]]:
-    """Parse the Z-Wave JSON config files and create a consolidated device db."""
-    logging.debug("Parsing extracted config files")
-    json_files = Path(os.path.join(TMP_DIR, "devices")).glob("**/*.json")
+def _iter_zjs_config_files(tar_path: str) -> Iterator[tuple[str, bytes]]:
+    """Stream the device config files from the Z-Wave JS tarfile."""
+    with tarfile.open(tar_path, "r|*") as tar:
+        devices_path: str | None = None
+        for member in tar:
+            if devices_path is None:
+                # the first member is the root directory of the archive
+                devices_path = (
+                    f"{member.name.split('/')[0]}{ZJS_TAR_CONFIG_BASE}devices/"
+                )
+            if (
+                member.isfile()
+                and member.name.startswith(devices_path)
+                and member.name.endswith(".json")
+                and "/templates/" not in member.name
+                and (file := tar.extractfile(member))
+            ):
+                yield member.name[len(devices_path) :], file.read()
+
+
+def _parse_zjs_config_file(
+    path: str, content: bytes
+) -> dict[str, dict[str, str]] | None:
+    """Parse a Z-Wave JS device config file into device db entries."""
+    try:
+        json_string = LINE_COMMENT_PATTERN.sub("", content.decode("utf-8"))
+        data = json.loads(BLOCK_COMMENT_PATTERN.sub("", json_string))
+        manufacturer_id = data["manufacturerId"]
+        device_info = {
+            "manufacturer": data["manufacturer"],
+            "label": data["label"],
+            "description": data["description"],
+        }
+    except (KeyError, TypeError, UnicodeDecodeError, ValueError):
+        logging.error("Unable to parse file %s", path)
+        return None
+
+    return {
+        f"{manufacturer_id}:{device.get('productType')}:{device.get('productId')}": (
+            device_info
+        )
+        for device in data.get("devices", [])
+    }
+
+
+def _load_manifest() -> dict[str, dict]:
+    """Load the manifest of previously parsed config files."""
+    try:
+        with open(ZJS_MANIFEST_FILE, encoding="utf-8") as manifest_file:
+            manifest: dict[str, dict] = json.load(manifest_file)
+    except (OSError, ValueError):
+        return {}
+    return manifest
 
-    device_db: dict[str, str | dict[str, str]] = {}
 
-    for file in json_files:
-        data = {}
-        try:
-            with open(file, encoding="utf-8") as json_file:
-                json_string = "".join(
-                    re.sub("((^|\\s+)//.*)|(/\\*.*\\*/)", "", line)
-                    for line in json_file.readlines()
+def _create_db_from_zjs_config_files(
+    updated_at: str, tar_path: str = ZJS_TAR_FILE, max_workers: int | None = None
+) -> dict[str, str | dict[str, str]]:
+    """Parse the Z-Wave JSON config files and create a consolidated device db.
+
+    Files whose content hash is in the manifest reuse their previously parsed
+    devices, the rest are parsed in a process pool (or in this process if
+    `max_workers` is 1).
+    """
+    logging.debug("Reading config files from download")
+    previous_manifest = _load_manifest()
+    hashes: dict[str, str] = {}
+    changed: dict[str, bytes] = {}
+    for path, content in _iter_zjs_config_files(tar_path):
+        hashes[path] = hashlib.sha256(content).hexdigest()
+        if previous_manifest.get(path, {}).get("sha256") != hashes[path]:
+            changed[path] = content
+
+    logging.debug("Parsing %s of %s config files", len(changed), len(hashes))
+    if not changed or max_workers == 1:
+        parsed = dict(
+            zip(changed, map(_parse_zjs_config_file, changed, changed.values()))
+        )
+    else:
+        with ProcessPoolExecutor(max_workers) as executor:
+            parsed = dict(
+                zip(
+                    changed,
+                    executor.map(
+                        _parse_zjs_config_file,
+                        changed,
+                        changed.values(),
+                        chunksize=PARSE_CHUNK_SIZE,
+                    ),
                 )
-                json_string = re.sub(r"(?m)^\s*?/\*(.|\n)*?\*/\s*?$", "", json_string)
-                data = json.loads(json_string)
-        except:  # noqa: E722 #pylint: disable=bare-except
-            logging.error("Unable to parse file %s", file)
-            continue
+            )
 
-        manufacturer_id = data["manufacturerId"]
-        manufacturer = data["manufacturer"]
-        label = data["label"]
-        description = data["description"]
-
-        for device in data.get("devices", []):
-            product_type = device.get("productType")
-            product_id = device.get("productId")
-            device_db[f"{manufacturer_id}:{product_type}:{product_id}"] = {
-                "manufacturer": manufacturer,
-                "label": label,
-                "description": description,
-            }
+    # merge in archive order so later files win, like before
+    manifest: dict[str, dict] = {}
+    device_db: dict[str, str | dict[str, str]] = {}
+    for path, sha256 in hashes.items():
+        devices = (
+            parsed[path] if path in changed else previous_manifest[path]["devices"]
+        )
+        if devices is not None:
+            manifest[path] = {"sha256": sha256, "devices": devices}
+            device_db.update(devices)
 
     if not device_db:
         logging.error("Unable to create consolidated device db")
@@ -83,6 +156,11 @@ def _create_db_from_zjs_config_files(
         device_db.update({UPDATED_AT: updated_at})
         with open(ZJS_DEVICE_CONFIG_DB_FILE, "w", encoding="utf-8") as device_file:
             device_file.write(json.dumps(device_db, sort_keys=True, indent=2))
+        logging.debug("Creating device index")
+        with open(ZJS_DEVICE_INDEX_FILE, "wb") as index_file:
+            index_file.write(build_device_index(device_db))
+        with open(ZJS_MANIFEST_FILE, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, sort_keys=True)
 
     return device_db
 
@@ -95,39 +173,6 @@ def _device_config_db_file_exists() -> bool:
     )
 
 
-def _extract_zjs_config_files() -> None:
-    """Extract the Z-Wave JSON config files."""
-
-    def _members(
-        tar_file: tarfile.TarFile, path: str = "."
-    ) -> Generator[tarfile.TarInfo, Any, Any]:
-        def _is_within_directory(target):
-            abs_directory = os.path.abspath(path)
-            abs_target = os.path.abspath(target)
-            prefix = os.path.commonprefix([abs_directory, abs_target])
-            return prefix == abs_directory
-
-        assert (firstmember := tar_file.next())
-        assert _is_within_directory(os.path.join(path, firstmember.name))
-        base_path = f"{firstmember.path}{ZJS_TAR_CONFIG_BASE}"
-        manufacturers_path = f"{base_path}manufacturers.json"
-        devices_path = f"{base_path}devices/"
-        base_length = len(base_path)
-        for member in tar_file.getmembers():
-            assert _is_within_directory(os.path.join(path, member.name))
-            if member.path.startswith(manufacturers_path) or (
-                member.path.startswith(devices_path)
-                and member.path.endswith(".json")
-                and "/templates/" not in member.path
-            ):
-                member.path = member.path[base_length:]
-                yield member
-
-    logging.debug("Extracting config files from download")
-    with tarfile.open(ZJS_TAR_FILE) as tar:
-        tar.extractall(TMP_DIR, members=_members(tar, TMP_DIR), numeric_owner=False)
-
-
 def _load_db_from_file() -> dict[str, str | dict[str, str]]:
     """Load the Z-Wave JS device config from the saved JSON file."""
     data: dict[str, str | dict[str, str]] = {}
@@ -144,7 +189,6 @@ async def download_zjs_device_config_db() -> dict:
         logging.debug("Beginning download process")
         _clean_temp_directory(create=True)
         await _download_zjs_tarfile()
-        _extract_zjs_config_files()
         data = _create_db_from_zjs_config_files(updated_at=start_date)
         _clean_temp_directory()
         return data
@@ -203,4 +247,6 @@ async def main() -> int:
 
 
 if __name__ == "__main__":
+    logging.getLogger("vivintpy.zjs_device_config_db").setLevel(logging.DEBUG)
+    logging.getLogger().setLevel(logging.DEBUG)
     sys.exit(asyncio.run(main()))
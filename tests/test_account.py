@@ -0,0 +1,234 @@
+"""Test the account."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from aiohttp import ClientResponseError, RequestInfo
+from yarl import URL
+
+from vivintpy.account import Account
+from vivintpy.devices.wireless_sensor import WirelessSensor
+from vivintpy.entity import UPDATE
+from vivintpy.exceptions import VivintSkyApiError
+
+
+def _system_data(panel_id: int, device_count: int = 3) -> dict:
+    return {
+        "system": {
+            "panid": panel_id,
+            "par": [
+                {
+                    "panid": panel_id,
+                    "parid": 1,
+                    "s": 0,
+                    "d": [
+                        {"_id": device_id, "t": "wireless_sensor", "n": "Door"}
+                        for device_id in range(1, device_count + 1)
+                    ],
+                }
+            ],
+            "u": [],
+        }
+    }
+
+
+def _authuser_data(*panel_ids: int) -> dict:
+    return {
+        "u": {"system": [{"panid": panel_id, "sn": "Home"} for panel_id in panel_ids]}
+    }
+
+
+def _device_message(panel_id: int, device_id: int, **data: Any) -> dict:
+    return {
+        "panid": panel_id,
+        "parid": 1,
+        "t": "account_partition",
+        "op": "u",
+        "da": {"d": [{"_id": device_id, **data}]},
+    }
+
+
+async def _create_account(
+    monkeypatch: pytest.MonkeyPatch,
+    *panel_ids: int,
+    failing_panel_ids: tuple[int, ...] = (),
+    **kwargs: Any,
+) -> Account:
+    account = Account("username", "password", client_session=object(), **kwargs)
+
+    async def _get_system_data(panel_id: int) -> dict:
+        await asyncio.sleep(0.01 * (panel_id % 5))
+        if panel_id in failing_panel_ids:
+            raise VivintSkyApiError(f"Unable to get system {panel_id}")
+        return _system_data(panel_id)
+
+    monkeypatch.setattr(account.api, "get_system_data", _get_system_data)
+    await account.refresh(_authuser_data(*panel_ids))
+    return account
+
+
+async def test_routing_table(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test systems, alarm panels and devices are looked up by id."""
+    account = await _create_account(monkeypatch, *range(1, 101))
+
+    assert (system := account.get_system(50))
+    assert system.id == 50
+    assert (alarm_panel := account.get_alarm_panel(50, 1))
+    assert alarm_panel in system.alarm_panels
+    assert (device := account.get_device(50, 1, 2))
+    assert device.alarm_panel is alarm_panel
+    assert account.get_system(101) is None
+    assert account.get_alarm_panel(50, 2) is None
+    assert account.get_device(50, 1, 4) is None
+
+
+async def test_pubnub_message_routing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test messages are routed to the target entity."""
+    account = await _create_account(monkeypatch, 1, 2)
+
+    account.handle_pubnub_message(
+        {"panid": 2, "parid": 1, "t": "account_partition", "op": "u", "da": {"s": 3}}
+    )
+    account.handle_pubnub_message(
+        {
+            "panid": 2,
+            "parid": 1,
+            "t": "account_partition",
+            "op": "u",
+            "da": {"d": [{"_id": 3, "s": True}]},
+        }
+    )
+    account.handle_pubnub_message(
+        {"panid": 1, "t": "account_system", "op": "u", "da": {"fea": {}}}
+    )
+
+    assert (alarm_panel := account.get_alarm_panel(2, 1))
+    assert alarm_panel.data["s"] == 3
+    assert (device := account.get_device(2, 1, 3))
+    assert device.data["s"] is True
+    assert (system := account.get_system(1))
+    assert system.data["fea"] == {}
+    assert (other_panel := account.get_alarm_panel(1, 1))
+    assert other_panel.data["s"] == 0
+
+
+async def test_refresh_is_concurrent(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test systems are fetched concurrently, isolating failures and keeping order."""
+    started = time.perf_counter()
+    account = await _create_account(
+        monkeypatch, *range(40, 0, -1), failing_panel_ids=(3, 10)
+    )
+    # the slowest system takes 0.04s, 40 sequential fetches would take 0.8s
+    assert time.perf_counter() - started < 0.3
+    assert [system.id for system in account.systems] == [
+        panel_id for panel_id in range(40, 0, -1) if panel_id not in (3, 10)
+    ]
+
+    await account.refresh(_authuser_data(*range(41, 0, -1)))
+    assert [system.id for system in account.systems][-3:] == [2, 1, 41]
+    assert [system.id for system in account.systems if system.id in (3, 10)] == []
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ClientResponseError(
+            RequestInfo(URL("https://www.vivintsky.com/api/systems/2"), "GET", {}),
+            (),
+            status=503,
+        ),
+        asyncio.TimeoutError(),
+    ],
+)
+async def test_refresh_isolates_request_errors(
+    monkeypatch: pytest.MonkeyPatch, error: Exception
+) -> None:
+    """Test a system failing with a request error doesn't drop the others."""
+    account = Account("username", "password", client_session=object())
+
+    async def _get_system_data(panel_id: int) -> dict:
+        if panel_id == 2:
+            raise error
+        return _system_data(panel_id)
+
+    monkeypatch.setattr(account.api, "get_system_data", _get_system_data)
+    await account.refresh(_authuser_data(1, 2, 3))
+    assert [system.id for system in account.systems] == [1, 3]
+
+
+async def test_refresh_concurrency_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test no more than `max_concurrent_refreshes` systems are fetched at once."""
+    account = Account(
+        "username", "password", client_session=object(), max_concurrent_refreshes=3
+    )
+    running = peak = 0
+
+    async def _get_system_data(panel_id: int) -> dict:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return _system_data(panel_id)
+
+    monkeypatch.setattr(account.api, "get_system_data", _get_system_data)
+    await account.refresh(_authuser_data(*range(1, 11)))
+    assert peak == 3
+    assert len(account.systems) == 10
+
+
+async def test_disconnect_drains_tasks_before_closing_api(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test background tasks finish before the API session is closed."""
+    account = Account("username", "password", client_session=object())
+    calls: list[str] = []
+
+    async def _task() -> None:
+        await asyncio.sleep(0.01)
+        calls.append("task")
+
+    async def _disconnect() -> None:
+        calls.append("api")
+
+    monkeypatch.setattr(account.api, "disconnect", _disconnect)
+    account.supervisor.create_task(_task())
+    await account.disconnect()
+    assert calls == ["task", "api"]
+
+
+async def test_event_stream(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test events of all entities are streamed, filtered and buffered."""
+    account = await _create_account(monkeypatch, 1, 2)
+
+    async with account.events(
+        types={UPDATE}, device_types={WirelessSensor}, buffer_size=2
+    ) as events:
+        account.handle_pubnub_message(_device_message(2, 1, s=True))
+        account.handle_pubnub_message(
+            {
+                "panid": 2,
+                "parid": 1,
+                "t": "account_partition",
+                "op": "u",
+                "da": {"s": 3},
+            }
+        )
+        account.handle_pubnub_message(_device_message(2, 2, s=True))
+        account.handle_pubnub_message(_device_message(1, 3, s=True, b=1))
+
+        event = await anext(events)
+        assert event.name == UPDATE
+        assert event.system is account.get_system(2)
+        assert event.alarm_panel is account.get_alarm_panel(2, 1)
+        assert event.device is account.get_device(2, 1, 2)
+        assert event.changed == {"s"}
+        assert (await anext(events)).changed == {"s", "b"}
+        assert events.dropped == 1
+
+    assert [event async for event in events] == []
+    await account.dispatcher.stop()
@@ -0,0 +1,180 @@
+"""Test the alarm panel."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from vivintpy.devices.alarm_panel import DEVICE_DELETED, DEVICE_DISCOVERED, AlarmPanel
+from vivintpy.entity import UPDATE
+from vivintpy.supervisor import TaskSupervisor
+
+
+def _device(device_id: int, **kwargs: Any) -> dict:
+    return {
+        "_id": device_id,
+        "t": "wireless_sensor",
+        "n": f"Name {device_id}",
+        **kwargs,
+    }
+
+
+def _create_panel(device_count: int) -> AlarmPanel:
+    data = {
+        "panid": 1,
+        "parid": 1,
+        "s": 0,
+        "d": [_device(device_id) for device_id in range(1, device_count + 1)],
+    }
+    return AlarmPanel(data, SimpleNamespace(name="Home", dispatcher=None))  # type: ignore[arg-type]
+
+
+def _message(operation: str, *devices: dict) -> dict:
+    return {"op": operation, "da": {"d": list(devices)}}
+
+
+def test_device_update_message() -> None:
+    """Test device messages update the device and the panel's raw data."""
+    panel = _create_panel(150)
+    device = panel.get_device(100)
+    assert device
+
+    panel.handle_pubnub_message(_message("u", {"_id": 100, "s": True}))
+    assert device.data["s"] is True
+    raw_device_data = next(d for d in panel.data["d"] if d["_id"] == 100)
+    assert raw_device_data["s"] is True
+
+    panel.handle_pubnub_message(_message("u", {"_id": 999, "s": True}))
+    assert panel.get_device(999) is None
+
+
+def test_device_delete_message() -> None:
+    """Test deleting a device removes it from the panel and its indexes."""
+    panel = _create_panel(10)
+    deleted: list[dict] = []
+    panel.on(DEVICE_DELETED, deleted.append)
+    device = panel.get_device(5)
+
+    panel.handle_pubnub_message(_message("d", {"_id": 5}))
+    assert panel.get_device(5) is None
+    assert device not in panel.devices
+    assert all(d["_id"] != 5 for d in panel.data["d"])
+    assert 5 in panel.unregistered_devices
+    assert deleted == [{"device": device}]
+
+    panel.handle_pubnub_message(_message("u", {"_id": 5, "s": True}))
+    assert len(panel.devices) == 9
+
+
+def test_refresh_keeps_indexes_consistent() -> None:
+    """Test a refresh updates existing devices and indexes new raw data."""
+    panel = _create_panel(3)
+    device = panel.get_device(2)
+
+    panel.refresh(
+        {
+            "panid": 1,
+            "parid": 1,
+            "s": 0,
+            "d": [_device(1), _device(2, s=True), _device(4)],
+        }
+    )
+    assert panel.get_device(2) is device
+    assert device and device.data["s"] is True
+    assert (new_device := panel.get_device(4))
+
+    panel.handle_pubnub_message(_message("u", {"_id": 4, "s": True}))
+    assert new_device.data["s"] is True
+    assert panel.data["d"][2] == new_device.data
+
+
+def test_refresh_only_updates_changed_devices() -> None:
+    """Test a refresh emits updates for changed devices and discovers/deletes others."""
+    panel = _create_panel(100)
+    updated: list[int] = []
+    for device in panel.devices:
+        device.on(UPDATE, lambda _, device_id=device.id: updated.append(device_id))
+    discovered: list[dict] = []
+    deleted: list[dict] = []
+    panel.on(DEVICE_DISCOVERED, discovered.append)
+    panel.on(DEVICE_DELETED, deleted.append)
+    removed = panel.get_device(100)
+
+    devices = [_device(device_id) for device_id in range(1, 100)] + [_device(101)]
+    devices[6]["s"] = True
+
+    panel.refresh({"panid": 1, "parid": 1, "s": 0, "d": devices})
+    assert updated == [7]
+    assert discovered == [{"device": panel.get_device(101)}]
+    assert deleted == [{"device": removed}]
+    assert panel.get_device(100) is None
+    assert len(panel.devices) == 100
+
+
+async def test_new_device_discovered_when_valid() -> None:
+    """Test a new device is loaded as soon as an update makes it valid."""
+    supervisor = TaskSupervisor()
+    fetched: list[int] = []
+
+    async def _get_device_data(panel_id: int, device_id: int) -> dict:
+        fetched.append(device_id)
+        return {"system": {"par": [{"panid": 1, "parid": 1, "d": []}]}}
+
+    system = SimpleNamespace(
+        name="Home",
+        dispatcher=None,
+        supervisor=supervisor,
+        api=SimpleNamespace(get_device_data=_get_device_data),
+    )
+    panel = AlarmPanel({"panid": 1, "parid": 1, "s": 0, "d": []}, system)  # type: ignore[arg-type]
+    discovered: list[dict] = []
+    panel.on(DEVICE_DISCOVERED, discovered.append)
+
+    panel.handle_pubnub_message(_message("c", _device(5), _device(6)))
+    await asyncio.sleep(0.01)
+    assert not fetched
+
+    started = time.perf_counter()
+    panel.handle_pubnub_message(
+        _message("u", {"_id": 5, "ser32": 1, "ec": 1251, "set": 1})
+    )
+    panel.handle_pubnub_message(_message("d", {"_id": 6}))
+    await supervisor.shutdown(timeout=1)
+    assert time.perf_counter() - started < 0.1
+    assert fetched == [5]
+    assert discovered == [{"device": panel.get_device(5)}]
+    assert supervisor.stats.completed == 2
+
+
+async def test_new_device_wait_does_not_hold_a_slot() -> None:
+    """Test new devices that never become valid neither block nor leak tasks."""
+    supervisor = TaskSupervisor(max_concurrency=1)
+
+    async def _get_device_data(panel_id: int, device_id: int) -> dict:
+        return {"system": {"par": [{"panid": 1, "parid": 1, "d": []}]}}
+
+    system = SimpleNamespace(
+        name="Home",
+        dispatcher=None,
+        supervisor=supervisor,
+        api=SimpleNamespace(get_device_data=_get_device_data),
+    )
+    panel = AlarmPanel({"panid": 1, "parid": 1, "s": 0, "d": []}, system)  # type: ignore[arg-type]
+
+    panel.handle_pubnub_message(_message("c", _device(5), _device(6)))
+    # unregistered before its task got to run
+    panel.refresh(
+        {"panid": 1, "parid": 1, "d": [_device(5), _device(6)], "ureg": [_device(6)]}
+    )
+    await asyncio.sleep(0.01)
+    assert supervisor.pending == 1
+
+    # the device still waiting to become valid doesn't hold up other tasks
+    ran = supervisor.create_task(asyncio.sleep, 0)
+    await asyncio.wait_for(ran, 1)
+
+    panel.handle_pubnub_message(_message("d", {"_id": 5}))
+    await asyncio.sleep(0.01)
+    assert supervisor.pending == 0
@@ -0,0 +1,335 @@
+"""Test the VivintSky API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import jwt
+import pytest
+
+from vivintpy.api import API_ENDPOINT, VivintSkyApi
+from vivintpy.exceptions import VivintSkyApiAuthenticationError, VivintSkyApiError
+from vivintpy.resilience import RetryPolicy, TokenBucket
+
+
+class FakeResponse:
+    """Fake aiohttp response."""
+
+    def __init__(
+        self, data: Any, status: int = 200, headers: dict[str, str] | None = None
+    ) -> None:
+        """Initialize the fake response."""
+        self.data = data
+        self.status = status
+        self.content_type = "application/json"
+        self.headers = headers or {}
+
+    async def __aenter__(self) -> FakeResponse:  # noqa: PYI034
+        """Enter the response context."""
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Exit the response context."""
+
+    async def read(self) -> bytes:
+        """Return the response body."""
+        return json.dumps(self.data).encode()
+
+    async def text(self) -> str:
+        """Return the response text."""
+        return str(self.data)
+
+    def raise_for_status(self) -> None:
+        """Raise for status."""
+
+    def release(self) -> None:
+        """Release the response."""
+
+
+class FakeSession:
+    """Fake aiohttp client session."""
+
+    def __init__(self, responses: dict[str, Any]) -> None:
+        """Initialize the fake session."""
+        self.responses = responses
+        self.requests: list[tuple[str, str]] = []
+        self.closed = False
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> FakeResponse:
+        self.requests.append((method, url))
+        await asyncio.sleep(0.01)
+        data = self.responses[url.rsplit("/api/", 1)[-1]]
+        if callable(data):
+            data = data()
+        return data if isinstance(data, FakeResponse) else FakeResponse(data)
+
+    async def get(self, url: str, **kwargs: Any) -> FakeResponse:
+        """Perform a get request."""
+        return await self._request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> FakeResponse:
+        """Perform a post request."""
+        return await self._request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> FakeResponse:
+        """Perform a put request."""
+        return await self._request("PUT", url, **kwargs)
+
+
+def _create_token(expires_in: float) -> dict:
+    id_token = jwt.encode(
+        {"exp": int(time.time() + expires_in)},
+        "a-secret-key-that-is-long-enough-for-hs256",
+    )
+    return {"id_token": id_token, "access_token": "access", "refresh_token": "r"}
+
+
+def _create_api(
+    responses: dict[str, Any], **kwargs: Any
+) -> tuple[VivintSkyApi, FakeSession]:
+    session = FakeSession(responses)
+    api = VivintSkyApi("username", "password", client_session=session, **kwargs)
+    return api, session
+
+
+async def test_reconnect_is_single_flight(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test concurrent requests with an expired session share one reconnect."""
+    api, _ = _create_api({"authuser": {"u": {}}})
+    valid = False
+    connects = 0
+
+    async def _connect() -> dict:
+        nonlocal connects, valid
+        connects += 1
+        await asyncio.sleep(0.01)
+        valid = True
+        return {}
+
+    monkeypatch.setattr(api, "connect", _connect)
+    monkeypatch.setattr(api, "is_session_valid", lambda: valid)
+
+    await asyncio.gather(*(api.get_authuser_data() for _ in range(30)))
+    assert connects == 1
+
+
+async def test_reconnect_failure_reaches_all_waiters(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a failed reconnect is raised to every waiting request."""
+    api, _ = _create_api({"authuser": {"u": {}}})
+    connects = 0
+
+    async def _connect() -> dict:
+        nonlocal connects
+        connects += 1
+        await asyncio.sleep(0.01)
+        raise VivintSkyApiAuthenticationError("Unable to login to Vivint")
+
+    monkeypatch.setattr(api, "connect", _connect)
+    monkeypatch.setattr(api, "is_session_valid", lambda: False)
+
+    results = await asyncio.gather(
+        *(api.get_authuser_data() for _ in range(5)), return_exceptions=True
+    )
+    assert connects == 1
+    assert all(isinstance(r, VivintSkyApiAuthenticationError) for r in results)
+
+
+async def test_reconnect_survives_cancelled_waiter(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test cancelling one waiter doesn't cancel the shared reconnect."""
+    api, _ = _create_api({"authuser": {"u": {}}})
+    valid = False
+
+    async def _connect() -> dict:
+        nonlocal valid
+        await asyncio.sleep(0.02)
+        valid = True
+        return {}
+
+    monkeypatch.setattr(api, "connect", _connect)
+    monkeypatch.setattr(api, "is_session_valid", lambda: valid)
+
+    first = asyncio.create_task(api.get_authuser_data())
+    second = asyncio.create_task(api.get_authuser_data())
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == {"u": {}}
+    assert first.cancelled()
+
+
+async def test_expired_session_reconnects_with_refresh_token() -> None:
+    """Test a coalesced request doesn't wait on the reconnect that depends on it."""
+    api, session = _create_api(
+        {
+            "https://id.vivint.com/oauth2/token": _create_token(3600),
+            "authuser": {"u": {}},
+        },
+        refresh_token="r",
+    )
+    results = await asyncio.wait_for(
+        asyncio.gather(api.get_authuser_data(), api.get_authuser_data()), 1
+    )
+    assert list(results) == [{"u": {}}, {"u": {}}]
+    assert api.is_session_valid()
+    assert [method for method, _ in session.requests].count("POST") == 1
+    assert await asyncio.wait_for(api.get_authuser_data(), 1) == {"u": {}}
+
+
+async def test_token_renewal() -> None:
+    """Test the token is renewed in the background ahead of its expiration."""
+    tokens = (_create_token(expires_in) for expires_in in (301, 3600))
+    api, session = _create_api(
+        {"https://id.vivint.com/oauth2/token": lambda: next(tokens)}
+    )
+    await api.refresh_token("r")
+    api.start_token_renewal(margin=300)
+    await asyncio.sleep(0)
+    assert (next_refresh := api.next_token_refresh)
+    assert next_refresh.timestamp() == pytest.approx(time.time() + 1, abs=1)
+
+    await asyncio.sleep(2.1)
+    assert len(session.requests) == 2
+    assert (next_refresh := api.next_token_refresh)
+    assert next_refresh.timestamp() == pytest.approx(time.time() + 3300, abs=3)
+
+    await api.stop_token_renewal()
+    assert api.next_token_refresh is None
+
+
+async def test_token_renewal_margin_exceeds_lifetime() -> None:
+    """Test a margin longer than the token's lifetime doesn't renew back-to-back."""
+    api, session = _create_api(
+        {"https://id.vivint.com/oauth2/token": lambda: _create_token(600)}
+    )
+    await api.refresh_token("r")
+    api.start_token_renewal(margin=3600)
+    await asyncio.sleep(0.05)
+    assert len(session.requests) == 1
+    assert (next_refresh := api.next_token_refresh)
+    assert next_refresh.timestamp() == pytest.approx(time.time() + 300, abs=3)
+    await api.stop_token_renewal()
+
+
+@pytest.mark.parametrize(
+    ("expires_in", "valid"), [(-60, False), (20, False), (60, True)]
+)
+async def test_is_session_valid(expires_in: float, valid: bool) -> None:
+    """Test session validity honors the token expiration and leeway."""
+    api, _ = _create_api(
+        {"https://id.vivint.com/oauth2/token": _create_token(expires_in)}
+    )
+    assert not api.is_session_valid()
+    await api.refresh_token("r")
+    assert api.is_session_valid() is valid
+
+
+async def test_get_requests_are_coalesced(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test identical concurrent get requests share one round-trip."""
+    api, session = _create_api({"systems/1": {"system": {"par": []}}})
+    monkeypatch.setattr(api, "is_session_valid", lambda: True)
+
+    results = await asyncio.gather(*(api.get_system_data(1) for _ in range(10)))
+    assert len(session.requests) == 1
+    assert all(result == {"system": {"par": []}} for result in results)
+
+    # each caller gets an independent copy
+    results[0]["system"]["par"].append({})
+    assert results[1] == {"system": {"par": []}}
+
+    await api.get_system_data(1)
+    assert len(session.requests) == 2
+
+
+async def test_response_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test cached endpoints are served from the cache until invalidated."""
+    api, session = _create_api(
+        {"authuser": {"u": {}}, "1/1/armedstates": {}},
+        cache_ttls={"get_authuser_data": 60},
+    )
+    monkeypatch.setattr(api, "is_session_valid", lambda: True)
+
+    await api.get_authuser_data()
+    (await api.get_authuser_data())["u"]["id"] = "mutated"
+    assert await api.get_authuser_data() == {"u": {}}
+    assert len(session.requests) == 1
+    assert (stats := api.cache_stats)
+    assert (stats.hits, stats.misses) == (2, 1)
+
+    api.invalidate_cache("get_authuser_data")
+    await api.get_authuser_data()
+    assert len(session.requests) == 2
+
+
+async def test_response_cache_stale_while_revalidate(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test stale entries are served while being refreshed in the background."""
+    versions = iter(range(10))
+    api, session = _create_api(
+        {"panel-login/1": lambda: {"version": next(versions)}},
+        cache_ttls={"get_panel_credentials": 0},
+        cache_stale_ttl=60,
+    )
+    monkeypatch.setattr(api, "is_session_valid", lambda: True)
+
+    assert await api.get_panel_credentials(1) == {"version": 0}
+    assert await api.get_panel_credentials(1) == {"version": 0}
+    await asyncio.sleep(0.05)
+    assert len(session.requests) == 2
+    assert await api.get_panel_credentials(1) == {"version": 1}
+
+
+async def test_retry_throttled_get(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test throttled gets are retried and slow down the rate limit."""
+    responses = iter(
+        [
+            FakeResponse({}, 429, {"Retry-After": "0"}),
+            FakeResponse({}, 503),
+            FakeResponse({"u": {}}),
+        ]
+    )
+    rate_limit = TokenBucket(100)
+    api, session = _create_api(
+        {"authuser": lambda: next(responses)},
+        rate_limits={API_ENDPOINT: rate_limit},
+        retry_policy=RetryPolicy(base_delay=0.001, max_delay=0.01),
+    )
+    monkeypatch.setattr(api, "is_session_valid", lambda: True)
+
+    assert await api.get_authuser_data() == {"u": {}}
+    assert len(session.requests) == 3
+    assert 50 <= rate_limit.rate < 100
+
+
+async def test_put_not_retried_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test puts are not retried unless a retry budget is configured."""
+    api, session = _create_api({"1/1/locks/2": FakeResponse({}, 503)})
+    monkeypatch.setattr(api, "is_session_valid", lambda: True)
+
+    with pytest.raises(VivintSkyApiError):
+        await api.set_lock_state(1, 1, 2, True)
+    assert len(session.requests) == 1
+
+
+async def test_request_stats(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test requests are recorded per endpoint with their status and size."""
+    responses = iter([FakeResponse({}, 503), FakeResponse({"s": True})])
+    api, _ = _create_api({"1/1/locks/2": lambda: next(responses)})
+    monkeypatch.setattr(api, "is_session_valid", lambda: True)
+
+    with pytest.raises(VivintSkyApiError):
+        await api.set_lock_state(1, 1, 2, True)
+    await api.set_lock_state(1, 1, 2, True)
+
+    stats = api.stats(reset=True)["set_lock_state"]
+    assert (stats.count, stats.errors) == (2, 1)
+    assert stats.statuses == {"503": 1, "200": 1}
+    assert stats.bytes_sent > 0
+    assert stats.bytes_received == len(b'{"s": true}') + len(b"{}")
+    assert stats.latency.p99 >= 0.01
+    assert not api.stats()
@@ -0,0 +1,29 @@
+"""Test the response cache."""
+
+from vivintpy.cache import ResponseCache
+
+
+def test_lru_eviction() -> None:
+    """Test the least recently used entry is evicted once full."""
+    cache = ResponseCache({"endpoint": 60}, max_size=2)
+    for panel_id in (1, 2):
+        cache.set(("endpoint", panel_id, f"path/{panel_id}", ()), {"id": panel_id})
+    assert cache.get(("endpoint", 1, "path/1", ()))
+
+    cache.set(("endpoint", 3, "path/3", ()), {"id": 3})
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    assert cache.get(("endpoint", 2, "path/2", ())) is None
+    assert cache.get(("endpoint", 1, "path/1", ())) == ({"id": 1}, False)
+
+
+def test_invalidate_by_panel() -> None:
+    """Test invalidating the entries for a single panel."""
+    cache = ResponseCache({"a": 60, "b": 60})
+    cache.set(("a", 1, "a/1", ()), {})
+    cache.set(("b", 1, "b/1", ()), {})
+    cache.set(("a", 2, "a/2", ()), {})
+
+    cache.invalidate(panel_id=1)
+    assert len(cache) == 1
+    assert cache.get(("a", 2, "a/2", ()))
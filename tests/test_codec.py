@@ -0,0 +1,16 @@
+"""Test the JSON codec."""
+
+from __future__ import annotations
+
+import json
+
+from vivintpy.codec import json_dumps, json_loads
+
+
+def test_round_trip() -> None:
+    """Test the codec round-trips API payloads like the stdlib json module."""
+    payload = {"system": {"panid": 1, "par": [{"d": [{"_id": 2, "n": "Lock"}]}]}}
+    assert isinstance(json_dumps(payload), str)
+    assert json.loads(json_dumps(payload)) == payload
+    assert json_loads(json.dumps(payload).encode()) == payload
+    assert json_loads(json.dumps(payload)) == payload
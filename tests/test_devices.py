@@ -1,10 +1,149 @@
 """Test the devices."""
 
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
 from vivintpy.devices import get_device_class
+from vivintpy.devices.alarm_panel import AlarmPanel
+from vivintpy.devices.door_lock import DoorLock
 from vivintpy.devices.switch import BinarySwitch
+from vivintpy.entity import UPDATE
 from vivintpy.enums import DeviceType
+from vivintpy.exceptions import VivintSkyApiError, VivintStateNotConfirmedError
+
+
+class FakeApi:
+    """Fake VivintSky API that can echo state changes over "PubNub"."""
+
+    def __init__(self, echo: bool, device_state: Any) -> None:
+        """Initialize the fake API."""
+        self.echo = echo
+        self.device_state = device_state
+        self.panel: AlarmPanel | None = None
+        self.requests: list[str] = []
+        self.fail = False
+
+    async def set_lock_state(
+        self, panel_id: int, partition_id: int, device_id: int, locked: bool
+    ) -> None:
+        """Set the lock state, echoing it shortly afterwards."""
+        self.requests.append("set_lock_state")
+        if self.fail:
+            raise VivintSkyApiError("Failed to set lock state")
+        if self.echo:
+            assert self.panel
+            asyncio.get_running_loop().call_later(
+                0.01,
+                self.panel.handle_pubnub_message,
+                {"op": "u", "da": {"d": [{"_id": device_id, "s": locked}]}},
+            )
+
+    async def get_device_data(self, panel_id: int, device_id: int) -> dict:
+        """Get the device data."""
+        self.requests.append("get_device_data")
+        device = {"_id": device_id, "s": self.device_state}
+        return {"system": {"par": [{"panid": panel_id, "d": [device]}]}}
+
+
+def _create_lock(api: FakeApi) -> DoorLock:
+    system = SimpleNamespace(name="Home", dispatcher=None, api=api)
+    panel = AlarmPanel(
+        {
+            "panid": 1,
+            "parid": 1,
+            "s": 0,
+            "d": [{"_id": 2, "t": DeviceType.DOOR_LOCK.value, "s": False}],
+        },
+        system,  # type: ignore[arg-type]
+    )
+    api.panel = panel
+    lock = panel.get_device(2)
+    assert isinstance(lock, DoorLock)
+    return lock
 
 
 def test_get_device_class() -> None:
     """Test get device class."""
     assert get_device_class(DeviceType.BINARY_SWITCH.value) == BinarySwitch
+
+
+@pytest.mark.parametrize("update_window", [None, 0.01])
+async def test_update_event_includes_device(update_window: float | None) -> None:
+    """Test device update events carry the device, with or without a window."""
+    lock = _create_lock(FakeApi(echo=False, device_state=False))
+    lock.update_window = update_window
+    updates: list[dict] = []
+    lock.on(UPDATE, updates.append)
+
+    lock.update_data({"s": True})
+    lock.flush_update()
+    assert len(updates) == 1
+    assert updates[0]["device"] is lock
+    assert updates[0]["changed"] == {"s"}
+
+
+async def test_wait_for_state_confirmed_by_echo() -> None:
+    """Test a command waits for the state to be echoed back."""
+    api = FakeApi(echo=True, device_state=False)
+    lock = _create_lock(api)
+
+    await lock.lock(wait_for_state=True, timeout=1)
+    assert lock.is_locked
+    assert api.requests == ["set_lock_state"]
+
+
+@pytest.mark.parametrize("device_state", [True, False])
+async def test_wait_for_state_falls_back_to_device_data(device_state: bool) -> None:
+    """Test a command without an echo checks the device data instead."""
+    api = FakeApi(echo=False, device_state=device_state)
+    lock = _create_lock(api)
+
+    if device_state:
+        await lock.lock(wait_for_state=True, timeout=0.01)
+    else:
+        with pytest.raises(VivintStateNotConfirmedError):
+            await lock.lock(wait_for_state=True, timeout=0.01)
+    assert lock.is_locked is device_state
+    assert api.requests == ["set_lock_state", "get_device_data"]
+
+
+async def test_optimistic_state_confirmed_by_echo() -> None:
+    """Test an optimistic command updates the state right away and keeps it."""
+    api = FakeApi(echo=True, device_state=False)
+    lock = _create_lock(api)
+    updates: list[dict] = []
+    lock.on(UPDATE, updates.append)
+
+    await lock.lock(timeout=0.05, optimistic=True)
+    assert lock.is_locked
+    await asyncio.sleep(0.1)
+    assert lock.is_locked
+    assert [update.get("optimistic") for update in updates] == [True]
+
+
+@pytest.mark.parametrize("fail", [True, False])
+async def test_optimistic_state_rolled_back(fail: bool) -> None:
+    """Test an optimistic state is rolled back if the command fails or times out."""
+    api = FakeApi(echo=False, device_state=False)
+    api.fail = fail
+    lock = _create_lock(api)
+    updates: list[dict] = []
+    lock.on(UPDATE, updates.append)
+
+    if fail:
+        with pytest.raises(VivintSkyApiError):
+            await lock.lock(timeout=0.05, optimistic=True)
+    else:
+        await lock.lock(timeout=0.05, optimistic=True)
+        assert lock.is_locked
+        await asyncio.sleep(0.1)
+    assert not lock.is_locked
+    assert [(u.get("optimistic"), u.get("rollback")) for u in updates] == [
+        (True, None),
+        (None, True),
+    ]
@@ -0,0 +1,130 @@
+"""Test the event dispatcher."""
+
+from __future__ import annotations
+
+import asyncio
+
+from vivintpy.dispatch import BackpressurePolicy, EventDispatcher
+from vivintpy.entity import UPDATE, Entity
+
+
+class DispatchedEntity(Entity):
+    """Entity with a dispatcher."""
+
+    def __init__(self, data: dict, dispatcher: EventDispatcher) -> None:
+        """Initialize the entity."""
+        super().__init__(data)
+        self._dispatcher = dispatcher
+
+    @property
+    def dispatcher(self) -> EventDispatcher:
+        """Return the dispatcher."""
+        return self._dispatcher
+
+
+async def test_slow_listener_does_not_block_others() -> None:
+    """Test coroutine listeners run in workers without holding up other events."""
+    dispatcher = EventDispatcher(workers=2)
+    slow = DispatchedEntity({"s": False}, dispatcher)
+    fast = DispatchedEntity({"s": False}, dispatcher)
+    release = asyncio.Event()
+    received: list[str] = []
+
+    async def _slow_listener(data: dict) -> None:
+        await release.wait()
+        received.append("slow")
+
+    def _failing_listener(data: dict) -> None:
+        raise ValueError("listener error")
+
+    slow.on(UPDATE, _slow_listener)
+    fast.on(UPDATE, lambda data: received.append("fast"))
+    fast.on(UPDATE, _failing_listener)
+
+    slow.update_data({"s": True})
+    fast.update_data({"s": True})
+    assert received == []
+    await asyncio.sleep(0.01)
+    assert received == ["fast"]
+
+    release.set()
+    await dispatcher.join()
+    assert received == ["fast", "slow"]
+    stats = dispatcher.stats
+    assert (stats.dispatched, stats.failed) == (2, 1)
+    await dispatcher.stop()
+
+
+async def test_drop_oldest_policy() -> None:
+    """Test the oldest queued calls are dropped when the queue is full."""
+    dispatcher = EventDispatcher(max_size=3, policy=BackpressurePolicy.DROP_OLDEST)
+    entity = DispatchedEntity({"s": 0}, dispatcher)
+    received: list[int] = []
+    entity.on(UPDATE, lambda data: received.append(data["data"]["s"]))
+
+    for state in range(1, 6):
+        entity.update_data({"s": state})
+    await dispatcher.join()
+    assert received == [3, 4, 5]
+    assert dispatcher.stats.dropped == 2
+    await dispatcher.stop()
+
+
+async def test_coalesce_policy() -> None:
+    """Test queued updates for the same entity are merged into one call."""
+    dispatcher = EventDispatcher(policy=BackpressurePolicy.COALESCE)
+    entity = DispatchedEntity({"s": 0, "b": 0}, dispatcher)
+    other = DispatchedEntity({"s": 0}, dispatcher)
+    received: list[dict] = []
+    entity.on(UPDATE, received.append)
+    other.on(UPDATE, received.append)
+
+    entity.update_data({"s": 1})
+    other.update_data({"s": 1})
+    entity.update_data({"b": 1})
+    entity.update_data({"s": 2})
+    await dispatcher.join()
+    assert received == [
+        {"data": {"s": 2, "b": 1}, "changed": {"s", "b"}},
+        {"data": {"s": 1}, "changed": {"s"}},
+    ]
+    assert dispatcher.stats.coalesced == 2
+    await dispatcher.stop()
+
+
+async def test_block_policy_runs_listener_inline() -> None:
+    """Test the emitter runs listeners itself when the queue is full."""
+    dispatcher = EventDispatcher(max_size=1, policy=BackpressurePolicy.BLOCK)
+    entity = DispatchedEntity({"s": 0}, dispatcher)
+    received: list[int] = []
+    entity.on(UPDATE, lambda data: received.append(data["data"]["s"]))
+
+    for state in range(1, 4):
+        entity.update_data({"s": state})
+    assert received == [2, 3]
+    await dispatcher.join()
+    assert received == [2, 3, 1]
+    assert (dispatcher.stats.inline, dispatcher.stats.dropped) == (2, 0)
+    await dispatcher.stop()
+
+
+async def test_block_policy_bounds_coroutine_listeners() -> None:
+    """Test a slow coroutine listener can't grow a full queue past its limit."""
+    dispatcher = EventDispatcher(max_size=10, workers=1)
+    entity = DispatchedEntity({"s": 0}, dispatcher)
+    release = asyncio.Event()
+
+    async def _slow_listener(data: dict) -> None:
+        await release.wait()
+
+    entity.on(UPDATE, _slow_listener)
+    for state in range(1, 1001):
+        entity.update_data({"s": state})
+    assert dispatcher.pending <= 10
+    stats = dispatcher.stats
+    assert stats.inline == 990
+    assert stats.dropped >= 980
+
+    # queued coroutines are closed, not left unawaited, when stopped
+    await dispatcher.stop(timeout=0.01)
+    assert dispatcher.pending == 0
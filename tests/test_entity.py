@@ -0,0 +1,120 @@
+"""Test the entity."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from vivintpy.devices.alarm_panel import AlarmPanel
+from vivintpy.entity import UPDATE, Entity
+
+
+def test_update_data_changed_keys() -> None:
+    """Test updates report the changed keys and no-op updates are suppressed."""
+    entity = Entity({"s": False, "n": "Door", "b": 0})
+    events: list[dict] = []
+    entity.on(UPDATE, events.append)
+
+    entity.update_data({"s": True, "n": "Door"})
+    entity.update_data({"s": True})
+    entity.update_data({"s": True, "n": "Door"}, override=True)
+    assert events == [
+        {"data": {"s": True, "n": "Door"}, "changed": {"s"}},
+        {"data": {"s": True, "n": "Door"}, "changed": {"b"}},
+    ]
+    assert entity.data == {"s": True, "n": "Door"}
+
+
+def test_attribute_filtered_listener() -> None:
+    """Test a listener with an attribute filter only runs when they change."""
+    entity = Entity({"s": False, "n": "Door"})
+    events: list[dict] = []
+    unsubscribe = entity.on(UPDATE, events.append, attrs={"s"})
+
+    entity.update_data({"n": "Back Door"})
+    entity.update_data({"s": True, "n": "Front Door"})
+    assert [event["changed"] for event in events] == [{"s", "n"}]
+
+    unsubscribe()
+    entity.update_data({"s": False})
+    assert len(events) == 1
+
+
+async def test_update_window() -> None:
+    """Test updates within the window are merged into one event."""
+    entity = Entity({"s": 0, "b": 0})
+    entity.update_window = 0.05
+    events: list[dict] = []
+    entity.on(UPDATE, events.append)
+
+    entity.update_data({"s": 1})
+    entity.update_data({"b": 1})
+    entity.update_data({"s": 2})
+    assert entity.data == {"s": 2, "b": 1}
+    assert events == []
+
+    await asyncio.sleep(0.1)
+    assert events == [{"data": {"s": 2, "b": 1}, "changed": {"s", "b"}}]
+
+
+async def test_update_window_priority_bypass() -> None:
+    """Test priority updates and other events are emitted right away, in order."""
+    panel = AlarmPanel(
+        {"panid": 1, "parid": 1, "s": 0, "d": []},
+        SimpleNamespace(name="Home", dispatcher=None),  # type: ignore[arg-type]
+    )
+    panel.update_window = 60
+    events: list[tuple[str, dict]] = []
+    panel.on(UPDATE, lambda data: events.append((UPDATE, data)))
+    panel.on("other", lambda data: events.append(("other", data)))
+
+    panel.update_data({"n": "Panel"})
+    panel.update_data({"s": 3})
+    assert events == [
+        (
+            UPDATE,
+            {"data": {"n": "Panel", "s": 3}, "changed": {"n", "s"}, "device": panel},
+        )
+    ]
+
+    panel.update_data({"n": "Home"})
+    panel.emit("other", {})
+    assert [name for name, _ in events] == [UPDATE, UPDATE, "other"]
+
+
+async def test_wait_for() -> None:
+    """Test waiting for a condition resolves on update, timeout or cancellation."""
+    entity = Entity({"s": 0})
+
+    waiter = asyncio.create_task(entity.wait_for(lambda: entity.data["s"] == 2))
+    await asyncio.sleep(0)
+    entity.update_data({"s": 1})
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    entity.update_data({"s": 2})
+    assert await waiter is True
+
+    assert await entity.wait_for(lambda: entity.data["s"] == 3, timeout=0.01) is False
+
+    waiter = asyncio.create_task(entity.wait_for(lambda: entity.data["s"] == 3))
+    await asyncio.sleep(0)
+    entity.cancel_waiters()
+    assert await waiter is False
+
+
+async def test_coroutine_listener_is_supervised() -> None:
+    """Test coroutine listeners run as supervised tasks without a dispatcher."""
+    entity = Entity({"s": False})
+    calls: list[dict] = []
+
+    async def _listener(data: dict) -> None:
+        await asyncio.sleep(0.01)
+        calls.append(data)
+
+    entity.on(UPDATE, _listener)
+    entity.update_data({"s": True})
+    assert entity.supervisor.pending == 1
+
+    await entity.supervisor.shutdown(timeout=1)
+    assert calls == [{"data": {"s": True}, "changed": {"s"}}]
+    assert entity.supervisor.stats.completed == 1
@@ -0,0 +1,125 @@
+"""Test the Z-Wave JS device config db generator."""
+
+from __future__ import annotations
+
+import io
+import json
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from script import gen_zjs_device_config_db as gen
+from vivintpy.zjs_device_config_db import _DeviceIndex
+
+ROOT = "zwave-js-node-zwave-js-0123abc"
+DEVICES = f"{ROOT}/packages/config/config/devices"
+
+LOCK_CONFIG = """// Yale Assure lock
+{
+  "manufacturer": "Yale",
+  "manufacturerId": "0x0129",
+  /* multi-line
+     comment */
+  "label": "YRD256", // trailing comment
+  "description": "Assure Lock",
+  "devices": [
+    {"productType": "0x8004", "productId": "0x0600"},
+    {"productType": "0x8004", "productId": "0x0601"}
+  ],
+  "metadata": {"manual": "https://example.com/manual.pdf"}
+}
+"""
+SENSOR_CONFIG = """{
+  "manufacturer": "Zooz",
+  "manufacturerId": "0x027a",
+  "label": "ZSE40",
+  "description": "4-in-1 Sensor",
+  "devices": [{"productType": "0x2021", "productId": "0x2101"}]
+}
+"""
+
+
+def _create_tarball(path: Path, files: dict[str, str]) -> str:
+    with tarfile.open(path, "w:gz") as tar:
+        root = tarfile.TarInfo(ROOT)
+        root.type = tarfile.DIRTYPE
+        tar.addfile(root)
+        for name, content in files.items():
+            info = tarfile.TarInfo(f"{ROOT}/{name}")
+            info.size = len(data := content.encode())
+            tar.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+@pytest.fixture(name="output")
+def output_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Write the generated files to a temp directory."""
+    monkeypatch.setattr(gen, "ZJS_DEVICE_CONFIG_DB_FILE", str(tmp_path / "db.json"))
+    monkeypatch.setattr(gen, "ZJS_DEVICE_INDEX_FILE", str(tmp_path / "db.bin"))
+    monkeypatch.setattr(gen, "ZJS_MANIFEST_FILE", str(tmp_path / "manifest.json"))
+    return tmp_path
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_create_db(output: Path, max_workers: int) -> None:
+    """Test the db and index are created from a tarball."""
+    tar_path = _create_tarball(
+        output / "zjs.tar.gz",
+        {
+            "packages/config/config/manufacturers.json": "{}",
+            f"{DEVICES.removeprefix(ROOT + '/')}/0x0129/yrd256.json": LOCK_CONFIG,
+            f"{DEVICES.removeprefix(ROOT + '/')}/templates/master.json": "{",
+            "README.md": "# Z-Wave JS",
+        },
+    )
+
+    device_db = gen._create_db_from_zjs_config_files(
+        "2024-01-01T00:00:00", tar_path, max_workers=max_workers
+    )
+
+    lock = {"manufacturer": "Yale", "label": "YRD256", "description": "Assure Lock"}
+    assert device_db == {
+        "0x0129:0x8004:0x0600": lock,
+        "0x0129:0x8004:0x0601": lock,
+        "updated_at": "2024-01-01T00:00:00",
+    }
+    assert json.loads((output / "db.json").read_text()) == device_db
+    index = _DeviceIndex((output / "db.bin").read_bytes())
+    assert index.get(0x0129_8004_0600) == lock
+
+
+def test_unchanged_files_are_skipped(
+    output: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test files that haven't changed since the last run aren't parsed again."""
+    parsed: list[str] = []
+    parse = gen._parse_zjs_config_file
+
+    def _parse(path: str, content: bytes) -> dict | None:
+        parsed.append(path)
+        devices: dict | None = parse(path, content)
+        return devices
+
+    monkeypatch.setattr(gen, "_parse_zjs_config_file", _parse)
+    lock_path = f"{DEVICES.removeprefix(ROOT + '/')}/0x0129/yrd256.json"
+    sensor_path = f"{DEVICES.removeprefix(ROOT + '/')}/0x027a/zse40.json"
+
+    tar_path = _create_tarball(
+        output / "v1.tar.gz", {lock_path: LOCK_CONFIG, sensor_path: SENSOR_CONFIG}
+    )
+    gen._create_db_from_zjs_config_files("v1", tar_path, max_workers=1)
+    assert parsed == ["0x0129/yrd256.json", "0x027a/zse40.json"]
+
+    parsed.clear()
+    tar_path = _create_tarball(
+        output / "v2.tar.gz",
+        {
+            lock_path: LOCK_CONFIG,
+            sensor_path: SENSOR_CONFIG.replace("ZSE40", "ZSE40 700"),
+        },
+    )
+    device_db = gen._create_db_from_zjs_config_files("v2", tar_path, max_workers=1)
+    assert parsed == ["0x027a/zse40.json"]
+    assert len(device_db) == 4
+    assert device_db["0x027a:0x2021:0x2101"]["label"] == "ZSE40 700"
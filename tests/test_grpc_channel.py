@@ -0,0 +1,70 @@
+"""Test the gRPC channel manager."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import grpc
+import pytest
+
+from vivintpy.grpc_channel import GrpcChannelManager
+
+
+class FakeChannel:
+    """Fake gRPC channel."""
+
+    def __init__(self) -> None:
+        """Initialize the fake channel."""
+        self.state = grpc.ChannelConnectivity.READY
+        self.closed = False
+
+    def get_state(self, try_to_connect: bool = False) -> grpc.ChannelConnectivity:
+        """Return the channel state."""
+        return self.state
+
+    def unary_unary(self, *args: Any, **kwargs: Any) -> None:
+        """Fake stub method factory."""
+
+    async def close(self) -> None:
+        """Close the channel."""
+        self.closed = True
+
+
+@pytest.fixture(name="channels")
+def channels_fixture(monkeypatch: pytest.MonkeyPatch) -> list[FakeChannel]:
+    """Patch channel creation and return the created channels."""
+    channels: list[FakeChannel] = []
+
+    def _secure_channel(*args: Any, **kwargs: Any) -> FakeChannel:
+        channels.append(channel := FakeChannel())
+        return channel
+
+    monkeypatch.setattr(grpc.aio, "secure_channel", _secure_channel)
+    return channels
+
+
+async def test_channel_is_shared(channels: list[FakeChannel]) -> None:
+    """Test concurrent callers share a single lazily opened channel."""
+    manager = GrpcChannelManager("localhost:50051")
+    assert not manager.is_open
+
+    stubs = await asyncio.gather(*(manager.get_stub() for _ in range(10)))
+    assert len(channels) == 1
+    assert all(stub is stubs[0] for stub in stubs)
+
+    await manager.close()
+    assert channels[0].closed
+    assert not manager.is_open
+
+
+async def test_channel_reconnects_after_failure(channels: list[FakeChannel]) -> None:
+    """Test a failed channel is replaced on next use."""
+    manager = GrpcChannelManager("localhost:50051")
+    await manager.get_stub()
+    channels[0].state = grpc.ChannelConnectivity.TRANSIENT_FAILURE
+
+    await manager.get_stub()
+    assert len(channels) == 2
+    assert channels[0].closed
+    assert not channels[1].closed
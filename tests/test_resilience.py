@@ -0,0 +1,85 @@
+"""Test the rate limiting and retry helpers."""
+
+import time
+
+import pytest
+
+from vivintpy.enums import CircuitState
+from vivintpy.exceptions import VivintSkyApiCircuitOpenError
+from vivintpy.resilience import (
+    CircuitBreaker,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+async def test_token_bucket_limits_rate() -> None:
+    """Test requests beyond the burst capacity wait for tokens."""
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(10):
+        await bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_token_bucket_adapts() -> None:
+    """Test the rate halves when throttled and recovers after successes."""
+    bucket = TokenBucket(rate=10)
+    bucket.throttle()
+    bucket.throttle()
+    assert bucket.rate == 2.5
+    for _ in range(20):
+        bucket.recover()
+    assert bucket.rate == 10
+
+
+def test_backoff_is_bounded() -> None:
+    """Test decorrelated jitter stays within the configured bounds."""
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+    delay = None
+    for _ in range(20):
+        delay = policy.backoff(delay)
+        assert 1 <= delay <= 5
+
+
+def test_parse_retry_after() -> None:
+    """Test parsing delay-seconds and HTTP-date Retry-After values."""
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("invalid") is None
+    assert parse_retry_after(None) is None
+
+
+def test_circuit_breaker() -> None:
+    """Test the circuit opens after repeated failures and closes after a probe."""
+    changes: list[tuple[CircuitState, CircuitState]] = []
+    breaker = CircuitBreaker(
+        "api",
+        failure_threshold=2,
+        recovery_timeout=0,
+        on_state_change=lambda _, previous, state: changes.append((previous, state)),
+    )
+    for _ in range(2):
+        breaker.acquire()
+        breaker.release(False)
+    assert changes == [(CircuitState.CLOSED, CircuitState.OPEN)]
+
+    # the recovery timeout has passed, so only a single probe is allowed
+    breaker.acquire()
+    assert changes[-1] == (CircuitState.OPEN, CircuitState.HALF_OPEN)
+    with pytest.raises(VivintSkyApiCircuitOpenError):
+        breaker.acquire()
+
+    breaker.release(True)
+    assert breaker.state == CircuitState.CLOSED
+    assert changes[-1] == (CircuitState.HALF_OPEN, CircuitState.CLOSED)
+
+
+def test_circuit_breaker_fails_fast_while_open() -> None:
+    """Test calls are rejected until the recovery timeout passes."""
+    breaker = CircuitBreaker("grpc", failure_threshold=1, recovery_timeout=60)
+    breaker.acquire()
+    breaker.release(False)
+    with pytest.raises(VivintSkyApiCircuitOpenError):
+        breaker.acquire()
@@ -0,0 +1,43 @@
+"""Test the request stats."""
+
+from __future__ import annotations
+
+import pytest
+
+from vivintpy.stats import LatencyHistogram, RequestSample, RequestStats
+
+
+def test_latency_histogram_percentiles() -> None:
+    """Test percentiles are within the bucket resolution of the real values."""
+    histogram = LatencyHistogram()
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.mean == pytest.approx(0.5005)
+    assert histogram.p50 == pytest.approx(0.5, rel=0.05)
+    assert histogram.p95 == pytest.approx(0.95, rel=0.05)
+    assert histogram.p99 == pytest.approx(0.99, rel=0.05)
+    assert histogram.percentile(100) == histogram.max == 1
+
+
+def test_request_stats() -> None:
+    """Test samples are aggregated per endpoint and passed to the sink."""
+    samples: list[RequestSample] = []
+    stats = RequestStats(samples.append)
+    stats.record(RequestSample("set_lock_state", 0.2, "200", False, 10, 2))
+    stats.record(RequestSample("set_lock_state", 0.4, "503", True, 10, 0))
+    stats.record(
+        RequestSample("get_system_data", 0.1, "200", False, 0, 100, {"ttfb": 0.05})
+    )
+
+    snapshot = stats.snapshot()
+    lock = snapshot["set_lock_state"]
+    assert (lock.count, lock.errors, lock.bytes_sent) == (2, 1, 20)
+    assert lock.statuses == {"200": 1, "503": 1}
+    assert snapshot["get_system_data"].phases["ttfb"].count == 1
+    assert len(samples) == 3
+
+    stats.reset()
+    assert not stats.snapshot()
+    assert lock.count == 2
@@ -0,0 +1,54 @@
+"""Test the task supervisor."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from vivintpy.supervisor import TaskSupervisor
+
+
+async def test_concurrency_limit_and_stats() -> None:
+    """Test tasks are limited in concurrency and their outcomes are recorded."""
+    supervisor = TaskSupervisor(max_concurrency=2)
+    running = peak = 0
+
+    async def _job(fail: bool) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if fail:
+            raise ValueError("job error")
+
+    tasks = [supervisor.create_task(_job(i == 0)) for i in range(6)]
+    tasks.append(supervisor.create_task(time.sleep, 0.01))
+    assert supervisor.pending == 7
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+    assert supervisor.pending == 0
+    stats = supervisor.stats
+    assert (stats.started, stats.completed, stats.failed) == (7, 6, 1)
+    assert stats.latency.count == 7
+    assert stats.wait.max >= 0.02
+
+
+async def test_shutdown_cancels_remaining_tasks() -> None:
+    """Test shutdown waits for short tasks and cancels the rest."""
+    supervisor = TaskSupervisor()
+    done: list[float] = []
+
+    async def _job(duration: float) -> None:
+        await asyncio.sleep(duration)
+        done.append(duration)
+
+    supervisor.create_task(_job, 0.01)
+    slow = supervisor.create_task(_job(60))
+    await supervisor.shutdown(timeout=0.05)
+
+    assert done == [0.01]
+    assert slow.cancelled()
+    assert supervisor.stats.cancelled == 1
+    assert supervisor.pending == 0
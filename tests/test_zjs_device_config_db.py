@@ -0,0 +1,76 @@
+"""Test the Z-Wave JS device config db."""
+
+from __future__ import annotations
+
+import json
+
+from vivintpy.zjs_device_config_db import (
+    ZJS_DEVICE_CONFIG_DB_FILE,
+    _DeviceIndex,
+    _load_index,
+    _lookup,
+    build_device_index,
+    get_zwave_device_info,
+)
+
+
+def test_device_index() -> None:
+    """Test lookups in a built device index."""
+    label = [{"$if": "productId === 0x0002", "value": "B-2"}, "B"]
+    index = _DeviceIndex(
+        build_device_index(
+            {
+                "0x0001:0x0002:0x0003": {
+                    "manufacturer": "Acme",
+                    "label": "A",
+                    "description": "Lock",
+                },
+                "0xffff:0x0001:0x0002": {
+                    "manufacturer": "Acme",
+                    "label": label,
+                    "description": "Sensor",
+                },
+                "updated_at": "2024-01-01T00:00:00",
+            }
+        )
+    )
+
+    assert index.updated_at == "2024-01-01T00:00:00"
+    assert index.get(0x0001_0002_0003) == {
+        "manufacturer": "Acme",
+        "label": "A",
+        "description": "Lock",
+    }
+    assert index.get(0xFFFF_0001_0002) == {
+        "manufacturer": "Acme",
+        "label": label,
+        "description": "Sensor",
+    }
+    assert index.get(0x0001_0002_0004) is None
+
+
+def test_prebuilt_index_matches_json() -> None:
+    """Test the shipped index returns the same device info as the JSON db."""
+    with open(ZJS_DEVICE_CONFIG_DB_FILE, encoding="utf8") as file:
+        device_db = json.load(file)
+
+    for key, device_info in device_db.items():
+        if key == "updated_at":
+            continue
+        ids = (int(part, 16) for part in key.split(":"))
+        assert get_zwave_device_info(*ids) == device_info
+    assert _load_index().updated_at == device_db["updated_at"]
+    assert get_zwave_device_info(0xFFFF, 0xFFFF, 0xFFFF) == {}
+    assert get_zwave_device_info(None, 1, 1) == {}
+
+
+def test_lookups_are_memoized() -> None:
+    """Test repeated lookups, including misses, are served from the memo."""
+    _lookup.cache_clear()
+    for _ in range(3):
+        get_zwave_device_info(0x0129, 0x8107, 0x49D1)["label"] = "mutated"
+        get_zwave_device_info(0xFFFF, 0xFFFF, 0xFFFF)
+
+    assert get_zwave_device_info(0x0129, 0x8107, 0x49D1)["label"] != "mutated"
+    info = _lookup.cache_info()
+    assert (info.hits, info.misses) == (5, 2)
@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from types import TracebackType
 
 import aiohttp
 from aiohttp.client_exceptions import ClientConnectionError
@@ -20,15 +23,101 @@ from .const import (
     SystemAttribute,
     UserAttribute,
 )
+from .devices import VivintDevice
+from .devices.alarm_panel import AlarmPanel
+from .dispatch import EventDispatcher
+from .entity import EventEmitter
+from .enums import CircuitState
 from .exceptions import VivintSkyApiError
 from .pubnub import PN_CHANNEL, PN_SUBSCRIBE_KEY, VivintPubNubSubscribeListener
+from .supervisor import TaskSupervisor
 from .system import System
-from .utils import first_or_none
+from .user import User
 
 _LOGGER = logging.getLogger(__name__)
 
+CIRCUIT_STATE_CHANGED = "circuit_state_changed"
 
-class Account:
+DEFAULT_MAX_CONCURRENT_REFRESHES = 8
+SHUTDOWN_TIMEOUT = 5
+DEFAULT_EVENT_BUFFER_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Event:
+    """Describe an event emitted by an account or one of its entities."""
+
+    name: str
+    data: dict
+    system: System | None = None
+    alarm_panel: AlarmPanel | None = None
+    device: VivintDevice | None = None
+    changed: frozenset[str] = frozenset()
+
+
+class EventStream:
+    """Asynchronously iterate over the events published by a dispatcher.
+
+    Once `buffer_size` events are waiting to be read, the oldest one is dropped.
+    """
+
+    def __init__(
+        self,
+        dispatcher: EventDispatcher,
+        create_event: Callable[[object, str, dict], Event | None],
+        buffer_size: int = DEFAULT_EVENT_BUFFER_SIZE,
+    ) -> None:
+        """Initialize the event stream."""
+        self.buffer_size = buffer_size
+        self.dropped = 0
+        self.__create_event = create_event
+        self.__queue: asyncio.Queue[Event | None] = asyncio.Queue()
+        self.__closed = False
+        self.__unsubscribe = dispatcher.subscribe(self.__publish)
+
+    def __aiter__(self) -> EventStream:
+        """Return the stream."""
+        return self
+
+    async def __anext__(self) -> Event:
+        """Return the next event."""
+        if self.__closed and self.__queue.empty():
+            raise StopAsyncIteration
+        if (event := await self.__queue.get()) is None:
+            raise StopAsyncIteration
+        return event
+
+    async def __aenter__(self) -> EventStream:  # noqa: PYI034
+        """Enter the stream context."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the stream."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop receiving events, ending the iteration once buffered ones are read."""
+        if not self.__closed:
+            self.__closed = True
+            self.__unsubscribe()
+            self.__queue.put_nowait(None)
+
+    def __publish(self, emitter: object, event_name: str, data: dict) -> None:
+        """Buffer an event, if wanted, dropping the oldest one if full."""
+        if (event := self.__create_event(emitter, event_name, data)) is None:
+            return
+        if self.__queue.qsize() >= self.buffer_size:
+            self.__queue.get_nowait()
+            self.dropped += 1
+        self.__queue.put_nowait(event)
+
+
+class Account(EventEmitter):
     """Class for interacting with VivintSky API using asyncio."""
 
     def __init__(
@@ -37,9 +126,27 @@ class Account:
         password: str | None = None,
         refresh_token: str | None = None,
         client_session: aiohttp.ClientSession | None = None,
+        token_refresh_margin: float | None = None,
+        cache_ttls: dict[str, float] | None = None,
+        max_concurrent_refreshes: int = DEFAULT_MAX_CONCURRENT_REFRESHES,
+        dispatcher: EventDispatcher | None = None,
+        supervisor: TaskSupervisor | None = None,
     ):
-        """Initialize an account."""
+        """Initialize an account.
+
+        If `token_refresh_margin` is set, the token is renewed in the background
+        that many seconds before it expires. See `VivintSkyApi` for `cache_ttls`.
+        At most `max_concurrent_refreshes` systems are fetched at once on refresh.
+        Events of the account and its entities are delivered by `dispatcher`,
+        which defaults to an `EventDispatcher` with the default queue settings.
+        Background tasks, such as loading new devices, are run by `supervisor`.
+        """
+        super().__init__()
+        self.__dispatcher = dispatcher or EventDispatcher()
+        self.__supervisor = supervisor or TaskSupervisor()
+        self.__max_concurrent_refreshes = max_concurrent_refreshes
         self.__connected = False
+        self.__token_refresh_margin = token_refresh_margin
         self.__load_devices = False
         self.__pubnub: PubNubAsyncio | None = None
         self.__pubnub_listener: VivintPubNubSubscribeListener | None = None
@@ -48,14 +155,29 @@ class Account:
             password=password,
             refresh_token=refresh_token,
             client_session=client_session,
+            cache_ttls=cache_ttls,
+            on_circuit_state_change=self.__on_circuit_state_change,
         )
         self.systems: list[System] = []
+        # routing table from panel id and (panel id, partition id) to entity
+        self.__system_routes: dict[int, System] = {}
+        self.__alarm_panel_routes: dict[tuple[int, int], AlarmPanel] = {}
 
     @property
     def api(self) -> VivintSkyApi:
         """Return the API."""
         return self._api
 
+    @property
+    def dispatcher(self) -> EventDispatcher:
+        """Return the dispatcher that delivers events."""
+        return self.__dispatcher
+
+    @property
+    def supervisor(self) -> TaskSupervisor:
+        """Return the supervisor that runs background tasks."""
+        return self.__supervisor
+
     @property
     def connected(self) -> bool:
         """Return True if connected."""
@@ -66,6 +188,63 @@ class Account:
         """Return the refresh token."""
         return self.api.tokens.get("refresh_token")
 
+    def get_system(self, panel_id: int) -> System | None:
+        """Get a system by panel id."""
+        return self.__system_routes.get(panel_id)
+
+    def get_alarm_panel(self, panel_id: int, partition_id: int) -> AlarmPanel | None:
+        """Get an alarm panel by panel id and partition id."""
+        return self.__alarm_panel_routes.get((panel_id, partition_id))
+
+    def get_device(
+        self, panel_id: int, partition_id: int, device_id: int
+    ) -> VivintDevice | None:
+        """Get a device by panel id, partition id and device id."""
+        if alarm_panel := self.get_alarm_panel(panel_id, partition_id):
+            return alarm_panel.get_device(device_id)
+        return None
+
+    def events(
+        self,
+        types: Iterable[str] | None = None,
+        device_types: Iterable[type[VivintDevice]] | None = None,
+        buffer_size: int = DEFAULT_EVENT_BUFFER_SIZE,
+    ) -> EventStream:
+        """Return a stream of the events of the account and its entities.
+
+        Only events named in `types` and, if set, events of devices that are
+        instances of `device_types` are included. Close the stream when done, e.g.
+        `async with account.events() as events: async for event in events: ...`.
+        """
+        event_names = frozenset(types) if types is not None else None
+        device_classes = tuple(device_types) if device_types is not None else None
+
+        def _create_event(emitter: object, event_name: str, data: dict) -> Event | None:
+            if event_names is not None and event_name not in event_names:
+                return None
+            system = alarm_panel = device = None
+            if isinstance(emitter, AlarmPanel):
+                alarm_panel, system = emitter, emitter.system
+            elif isinstance(emitter, VivintDevice):
+                device, alarm_panel = emitter, emitter.alarm_panel
+                system = alarm_panel.system if alarm_panel else None
+            elif isinstance(emitter, System):
+                system = emitter
+            elif isinstance(emitter, User):
+                system = emitter.system
+            if device_classes is not None and not isinstance(device, device_classes):
+                return None
+            return Event(
+                name=event_name,
+                data=data,
+                system=system,
+                alarm_panel=alarm_panel,
+                device=device,
+                changed=data.get("changed", frozenset()),
+            )
+
+        return EventStream(self.dispatcher, _create_event, buffer_size)
+
     async def connect(
         self, load_devices: bool = False, subscribe_for_realtime_updates: bool = False
     ) -> None:
@@ -77,6 +256,7 @@ class Account:
         # initialize the vivintsky cloud session
         authuser_data = await self.api.connect()
         self.__connected = True
+        self.__start_token_renewal()
 
         # subscribe to pubnub for realtime updates
         if subscribe_for_realtime_updates:
@@ -96,6 +276,9 @@ class Account:
                 self.__pubnub.remove_listener(self.__pubnub_listener)
                 await self.__pubnub_unsubscribe_all()
                 await self.__pubnub.stop()
+        # drain background work while the API session is still open
+        await self.supervisor.shutdown(SHUTDOWN_TIMEOUT)
+        await self.dispatcher.stop(SHUTDOWN_TIMEOUT)
         await self.api.disconnect()
         self.__connected = False
 
@@ -119,12 +302,27 @@ class Account:
     async def verify_mfa(self, code: str) -> None:
         """Verify multi-factor authentication with the VivintSky API."""
         await self.api.verify_mfa(code)
+        self.__start_token_renewal()
 
         # load all systems, panels and devices
         if self.__load_devices:
             _LOGGER.debug("Loading devices")
             await self.refresh()
 
+    def __on_circuit_state_change(
+        self, circuit: str, previous_state: CircuitState, state: CircuitState
+    ) -> None:
+        """Emit a circuit state changed event."""
+        self.emit(
+            CIRCUIT_STATE_CHANGED,
+            {"circuit": circuit, "previous_state": previous_state, "state": state},
+        )
+
+    def __start_token_renewal(self) -> None:
+        """Start renewing the token in the background, if enabled."""
+        if self.__token_refresh_margin is not None:
+            self.api.start_token_renewal(self.__token_refresh_margin)
+
     async def refresh(self, authuser_data: dict | None = None) -> None:
         """Refresh the account."""
         # make a call to vivint's authuser endpoint to get a list of all the system_accounts (locations) & panels if not supplied
@@ -136,36 +334,57 @@ class Account:
 
         if authuser_data:
             # for each system_account, make another call to load all the devices
-            for system_data in authuser_data[AuthUserAttribute.USERS][
-                UserAttribute.SYSTEM
-            ]:
-                # is this an existing account_system?
-                system = first_or_none(
-                    self.systems,
-                    lambda system, system_data=system_data: (  # type: ignore
-                        system.id == system_data[SystemAttribute.PANEL_ID]
-                    ),
+            systems_data = authuser_data[AuthUserAttribute.USERS][UserAttribute.SYSTEM]
+            semaphore = asyncio.Semaphore(self.__max_concurrent_refreshes)
+            systems = await asyncio.gather(
+                *(
+                    self.__refresh_system(system_data, semaphore)
+                    for system_data in systems_data
                 )
-                if system:
-                    await system.refresh()
-                else:
-                    full_system_data = await self.api.get_system_data(
-                        system_data[SystemAttribute.PANEL_ID]
-                    )
-                    self.systems.append(
-                        System(
-                            data=full_system_data,
-                            api=self.api,
-                            name=system_data.get(SystemAttribute.SYSTEM_NICKNAME),
-                            is_admin=system_data.get(SystemAttribute.ADMIN, False),
-                        )
-                    )
+            )
+
+            # add new systems in the order they are listed for the user
+            for system in filter(None, systems):
+                if system.id not in self.__system_routes:
+                    self.systems.append(system)
+                elif self.__system_routes[system.id] is not system:
+                    continue  # the same new system was listed more than once
+                self.__add_routes(system)
 
             _LOGGER.debug(
-                "Refreshed %s system(s)",
-                len(authuser_data[AuthUserAttribute.USERS][UserAttribute.SYSTEM]),
+                "Refreshed %s of %s system(s)",
+                sum(system is not None for system in systems),
+                len(systems_data),
             )
 
+    async def __refresh_system(
+        self, system_data: dict, semaphore: asyncio.Semaphore
+    ) -> System | None:
+        """Refresh an existing system or load a new one, returning None on failure."""
+        panel_id = system_data[SystemAttribute.PANEL_ID]
+        async with semaphore:
+            try:
+                # is this an existing account_system?
+                if system := self.__system_routes.get(panel_id):
+                    await system.refresh()
+                    return system
+                full_system_data = await self.api.get_system_data(panel_id)
+                return System(
+                    data=full_system_data,
+                    api=self.api,
+                    name=system_data.get(SystemAttribute.SYSTEM_NICKNAME, ""),
+                    is_admin=system_data.get(SystemAttribute.ADMIN, False),
+                    dispatcher=self.dispatcher,
+                    supervisor=self.supervisor,
+                )
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                VivintSkyApiError,
+            ) as err:
+                _LOGGER.error("Unable to refresh system %s: %s", panel_id, err)
+                return None
+
     async def subscribe_for_realtime_updates(
         self, authuser_data: dict | None = None
     ) -> None:
@@ -203,9 +422,26 @@ class Account:
             )
             return
 
-        system = first_or_none(self.systems, lambda system: system.id == panel_id)
+        system = self.__system_routes.get(panel_id)
         if not system:
             _LOGGER.debug("No system found with id %s: %s", panel_id, message)
             return
 
-        system.handle_pubnub_message(message)
+        # send partition messages straight to the alarm panel, if known
+        partition_id = message.get(PubNubMessageAttribute.PARTITION_ID)
+        if (
+            message.get(PubNubMessageAttribute.TYPE) == "account_partition"
+            and partition_id
+            and (alarm_panel := self.get_alarm_panel(panel_id, partition_id))
+        ):
+            alarm_panel.handle_pubnub_message(message)
+        else:
+            system.handle_pubnub_message(message)
+
+    def __add_routes(self, system: System) -> None:
+        """Add routes to a system and its alarm panels."""
+        self.__system_routes[system.id] = system
+        for alarm_panel in system.alarm_panels:
+            self.__alarm_panel_routes[(alarm_panel.id, alarm_panel.partition_id)] = (
+                alarm_panel
+            )
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import copy
+import functools
 import logging
+import random
 import ssl
+import time
 import urllib.parse
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from typing import Any
 
 import aiohttp
@@ -17,19 +23,24 @@ from aiohttp import ClientResponseError
 from aiohttp.client import _RequestContextManager
 from google.protobuf.message import Message
 
+from .cache import CacheKey, CacheStats, ResponseCache
+from .codec import json_dumps, json_loads
 from .const import (
     AuthenticationResponse,
     MfaVerificationResponse,
     SwitchAttribute,
     VivintDeviceAttribute,
 )
-from .enums import ArmedState, GarageDoorState, ZoneBypass
+from .enums import ArmedState, CircuitState, GarageDoorState, ZoneBypass
 from .exceptions import (
     VivintSkyApiAuthenticationError,
     VivintSkyApiError,
     VivintSkyApiMfaRequiredError,
 )
+from .grpc_channel import GrpcChannelManager
 from .proto import beam_pb2, beam_pb2_grpc
+from .resilience import CircuitBreaker, RetryPolicy, TokenBucket, parse_retry_after
+from .stats import EndpointStats, RequestSample, RequestStats, create_trace_config
 from .utils import generate_code_challenge, generate_state
 
 _LOGGER = logging.getLogger(__name__)
@@ -38,6 +49,26 @@ API_ENDPOINT = "https://www.vivintsky.com/api"
 AUTH_ENDPOINT = "https://id.vivint.com"
 GRPC_ENDPOINT = "grpc.vivintsky.com:50051"
 
+API_CIRCUIT = "api"
+AUTH_CIRCUIT = "auth"
+GRPC_CIRCUIT = "grpc"
+GRPC_FAILURE_CODES = (
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.INTERNAL,
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.UNKNOWN,
+)
+
+_RECONNECTING: ContextVar[VivintSkyApi | None] = ContextVar(
+    "_RECONNECTING", default=None
+)
+
+TOKEN_EXPIRATION_LEEWAY = 30
+TOKEN_REFRESH_MARGIN = 300
+TOKEN_REFRESH_RETRY_BASE = 5
+TOKEN_REFRESH_RETRY_MAX = 300
+TOKEN_REFRESH_MIN_INTERVAL = 10
+
 
 class VivintSkyApi:
     """Class to communicate with the VivintSky API."""
@@ -48,8 +79,36 @@ class VivintSkyApi:
         password: str | None = None,
         refresh_token: str | None = None,
         client_session: aiohttp.ClientSession | None = None,
+        cache_ttls: dict[str, float] | None = None,
+        cache_max_size: int = 256,
+        cache_stale_ttl: float = 0,
+        rate_limits: dict[str, TokenBucket] | None = None,
+        retry_policy: RetryPolicy | None = None,
+        on_circuit_state_change: Callable[[str, CircuitState, CircuitState], None]
+        | None = None,
+        on_request_sample: Callable[[RequestSample], None] | None = None,
     ) -> None:
-        """Initialize the VivintSky API."""
+        """Initialize the VivintSky API.
+
+        Responses from read endpoints can be cached by passing `cache_ttls`, a
+        mapping of method name (e.g. `get_authuser_data`) to TTL in seconds.
+        Expired entries are served for up to `cache_stale_ttl` more seconds while
+        they are refreshed in the background.
+
+        Requests to `API_ENDPOINT` or `AUTH_ENDPOINT` can be rate limited by passing
+        a `TokenBucket` for that host in `rate_limits`; a bucket may be shared by
+        several instances. Throttled and failed requests are retried according to
+        `retry_policy`.
+
+        Each endpoint family (`api`, `auth` and `grpc`) has a circuit breaker that
+        fails fast while the family is unhealthy; `on_circuit_state_change` is
+        called with the family name, previous and new state whenever one changes.
+
+        Every request is timed and counted per endpoint, see `stats`, and passed to
+        `on_request_sample` if set. Custom client sessions need a trace config from
+        `create_trace_config` to also time the DNS, connect and first byte phases.
+        """
+        self.__stats = RequestStats(on_request_sample)
         self.__username = username
         self.__password = password
         self.__refresh_token = refresh_token
@@ -59,25 +118,60 @@ class VivintSkyApi:
         self.__mfa_pending = False
         self.__mfa_type = "code"
         self.__token: dict | None = None
+        self.__token_expiration: float | None = None
+        self.__token_deadline = 0.0
+        self.__connect_task: asyncio.Task | None = None
+        self.__pending_gets: dict[tuple, tuple[asyncio.Task, list[int]]] = {}
+        self.__cache = (
+            ResponseCache(cache_ttls, cache_max_size, cache_stale_ttl)
+            if cache_ttls
+            else None
+        )
+        self.__revalidations: dict[CacheKey, asyncio.Task] = {}
+        self.__rate_limits = rate_limits or {}
+        self.__retry_policy = retry_policy or RetryPolicy()
+        self.__circuit_breakers = {
+            name: CircuitBreaker(name, on_state_change=on_circuit_state_change)
+            for name in (API_CIRCUIT, AUTH_CIRCUIT, GRPC_CIRCUIT)
+        }
+        self.__token_renewal_task: asyncio.Task | None = None
+        self.__next_token_refresh: float | None = None
+        self.__grpc_channel = GrpcChannelManager(
+            GRPC_ENDPOINT, interceptors=[self.__stats.grpc_interceptor()]
+        )
 
     @property
     def tokens(self) -> dict:
         """Return the tokens, if any."""
         return self.__token or {}
 
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        """Return the response cache counters, if caching is enabled."""
+        return self.__cache.stats if self.__cache is not None else None
+
+    @property
+    def circuit_breakers(self) -> dict[str, CircuitBreaker]:
+        """Return the circuit breakers by endpoint family."""
+        return self.__circuit_breakers
+
+    def stats(self, reset: bool = False) -> dict[str, EndpointStats]:
+        """Return the request statistics by endpoint, optionally resetting them."""
+        stats = self.__stats.snapshot()
+        if reset:
+            self.__stats.reset()
+        return stats
+
+    @property
+    def next_token_refresh(self) -> datetime | None:
+        """Return when the background token renewal will next refresh the token."""
+        if self.__next_token_refresh is None:
+            return None
+        return datetime.fromtimestamp(self.__next_token_refresh, timezone.utc)
+
     def is_session_valid(self) -> bool:
         """Return `True` if the token is still valid."""
-        if self.__token is None:
-            return False
-        try:
-            jwt.decode(
-                self.__token["id_token"],
-                options={"verify_signature": False, "verify_exp": True},
-                leeway=-30,
-            )
-        except jwt.ExpiredSignatureError:
-            return False
-        return True
+        return self.__token is not None and time.monotonic() < self.__token_deadline
 
     async def connect(self) -> dict:
         """Connect to VivintSky Cloud Service."""
@@ -91,9 +185,38 @@ class VivintSkyApi:
 
     async def disconnect(self) -> None:
         """Disconnect from VivintSky Cloud Service."""
+        await self.stop_token_renewal()
+        for task in self.__revalidations.values():
+            task.cancel()
+        await self.__grpc_channel.close()
         if not self.__has_custom_client_session:
             await self.__client_session.close()
 
+    def invalidate_cache(
+        self, endpoint: str | None = None, panel_id: int | None = None
+    ) -> None:
+        """Invalidate cached responses for an endpoint and/or panel, or all if neither."""
+        if self.__cache is not None:
+            self.__cache.invalidate(endpoint, panel_id)
+
+    def start_token_renewal(self, margin: float = TOKEN_REFRESH_MARGIN) -> None:
+        """Refresh the token in the background `margin` seconds before it expires."""
+        if self.__token_renewal_task and not self.__token_renewal_task.done():
+            return
+        self.__token_renewal_task = asyncio.create_task(self.__renew_token(margin))
+
+    async def stop_token_renewal(self) -> None:
+        """Stop the background token renewal, if running."""
+        if (task := self.__token_renewal_task) is None:
+            return
+        self.__token_renewal_task = None
+        self.__next_token_refresh = None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
     async def verify_mfa(self, code: str) -> None:
         """Verify multi-factor authentication code."""
         self.__mfa_pending = False
@@ -101,7 +224,8 @@ class VivintSkyApi:
         resp = await self.__post(
             endpoint,
             params={"client_id": "ios"},
-            data=json.dumps(
+            endpoint="verify_mfa",
+            data=json_dumps(
                 {
                     self.__mfa_type: code,
                     "username": self.__username,
@@ -110,7 +234,9 @@ class VivintSkyApi:
             ),
         )
         if resp and "url" in resp:
-            resp = await self.__get(path=f"{AUTH_ENDPOINT}{resp['url']}")
+            resp = await self.__get(
+                path=f"{AUTH_ENDPOINT}{resp['url']}", endpoint="verify_mfa"
+            )
             assert resp
 
             if "location" in resp:
@@ -126,9 +252,10 @@ class VivintSkyApi:
             path=f"{AUTH_ENDPOINT}/oauth2/token",
             params={"client_id": "ios"},
             data={"grant_type": "refresh_token", "refresh_token": refresh_token},
+            endpoint="refresh_token",
         )
         assert resp
-        self.__token = resp
+        self.__set_token(resp)
 
     async def get_authuser_data(self) -> dict:
         """
@@ -137,14 +264,18 @@ class VivintSkyApi:
         Poll the Vivint authuser API endpoint resource to gather user-related data including enumeration of the systems
         that user has access to.
         """
-        resp = await self.__get("authuser")
+        resp = await self.__get("authuser", endpoint="get_authuser_data")
         if not resp:
             raise VivintSkyApiAuthenticationError("Missing auth user data")
         return resp
 
     async def get_panel_credentials(self, panel_id: int) -> dict:
         """Get the panel credentials."""
-        resp = await self.__get(f"panel-login/{panel_id}")
+        resp = await self.__get(
+            f"panel-login/{panel_id}",
+            endpoint="get_panel_credentials",
+            panel_id=panel_id,
+        )
         if not resp:
             raise VivintSkyApiAuthenticationError(
                 "Unable to retrieve panel credentials."
@@ -157,6 +288,8 @@ class VivintSkyApi:
             f"systems/{panel_id}",
             headers={"Accept-Encoding": "application/json"},
             params={"includerules": "false"},
+            endpoint="get_system_data",
+            panel_id=panel_id,
         )
         if not resp:
             raise VivintSkyApiError("Unable to retrieve system data")
@@ -167,6 +300,8 @@ class VivintSkyApi:
         resp = await self.__get(
             f"systems/{panel_id}/system-update",
             headers={"Accept-Encoding": "application/json"},
+            endpoint="get_system_update",
+            panel_id=panel_id,
         )
         if not resp:
             raise VivintSkyApiError("Unable to retrieve system update")
@@ -174,7 +309,11 @@ class VivintSkyApi:
 
     async def update_panel_software(self, panel_id: int) -> None:
         """Request a panel software update."""
-        if not await self.__post(f"systems/{panel_id}/system-update"):
+        resp = await self.__post(
+            f"systems/{panel_id}/system-update", endpoint="update_panel_software"
+        )
+        self.invalidate_cache(panel_id=panel_id)
+        if not resp:
             raise VivintSkyApiError("Unable to update panel software")
 
     async def reboot_camera(
@@ -196,7 +335,11 @@ class VivintSkyApi:
 
     async def reboot_panel(self, panel_id: int) -> None:
         """Reboot a panel."""
-        if not await self.__post(f"systems/{panel_id}/reboot-panel"):
+        resp = await self.__post(
+            f"systems/{panel_id}/reboot-panel", endpoint="reboot_panel"
+        )
+        self.invalidate_cache(panel_id=panel_id)
+        if not resp:
             raise VivintSkyApiError("Unable to reboot panel")
 
     async def get_device_data(self, panel_id: int, device_id: int) -> dict:
@@ -204,6 +347,8 @@ class VivintSkyApi:
         resp = await self.__get(
             f"system/{panel_id}/device/{device_id}",
             headers={"Accept-Encoding": "application/json"},
+            endpoint="get_device_data",
+            panel_id=panel_id,
         )
         if not resp:
             raise VivintSkyApiError("Unable to retrieve device data")
@@ -215,8 +360,9 @@ class VivintSkyApi:
         """Set the alarm state."""
         resp = await self.__put(
             f"{panel_id}/{partition_id}/armedstates",
+            endpoint="set_alarm_state",
             headers={"Content-Type": "application/json;charset=UTF-8"},
-            data=json.dumps(
+            data=json_dumps(
                 {
                     "system": panel_id,
                     "partitionId": partition_id,
@@ -225,6 +371,7 @@ class VivintSkyApi:
                 }
             ),
         )
+        self.invalidate_cache(panel_id=panel_id)
         if resp is None:
             _LOGGER.error(
                 "Failed to set state to %s for panel %s",
@@ -235,7 +382,11 @@ class VivintSkyApi:
 
     async def trigger_alarm(self, panel_id: int, partition_id: int) -> None:
         """Trigger an alarm."""
-        if not await self.__post(f"{panel_id}/{partition_id}/alarm"):
+        resp = await self.__post(
+            f"{panel_id}/{partition_id}/alarm", endpoint="trigger_alarm"
+        )
+        self.invalidate_cache(panel_id=panel_id)
+        if not resp:
             _LOGGER.error("Failed to trigger alarm for panel %s", panel_id)
             raise VivintSkyApiError("Failed to trigger alarm")
 
@@ -298,16 +449,18 @@ class VivintSkyApi:
         """Open/Close garage door."""
         resp = await self.__put(
             f"{panel_id}/{partition_id}/door/{device_id}",
+            endpoint="set_garage_door_state",
             headers={
                 "Content-Type": "application/json;charset=utf-8",
             },
-            data=json.dumps(
+            data=json_dumps(
                 {
                     VivintDeviceAttribute.STATE: state,
                     VivintDeviceAttribute.ID: device_id,
                 }
             ),
         )
+        self.invalidate_cache(panel_id=panel_id)
         if resp is None:
             _LOGGER.debug(
                 "Failed to set state to %s for garage door %s @ %s:%s",
@@ -324,16 +477,18 @@ class VivintSkyApi:
         """Lock/Unlock door lock."""
         resp = await self.__put(
             f"{panel_id}/{partition_id}/locks/{device_id}",
+            endpoint="set_lock_state",
             headers={
                 "Content-Type": "application/json;charset=utf-8",
             },
-            data=json.dumps(
+            data=json_dumps(
                 {
                     VivintDeviceAttribute.STATE: locked,
                     VivintDeviceAttribute.ID: device_id,
                 }
             ),
         )
+        self.invalidate_cache(panel_id=panel_id)
         if resp is None:
             _LOGGER.debug(
                 "Failed to set state to %s for lock %s @ %s:%s",
@@ -350,10 +505,11 @@ class VivintSkyApi:
         """Bypass/unbypass a sensor."""
         resp = await self.__put(
             f"{panel_id}/{partition_id}/sensors/{device_id}",
+            endpoint="set_sensor_state",
             headers={
                 "Content-Type": "application/json;charset=utf-8",
             },
-            data=json.dumps(
+            data=json_dumps(
                 {
                     VivintDeviceAttribute.BYPASSED: ZoneBypass.MANUALLY_BYPASSED
                     if bypass
@@ -362,6 +518,7 @@ class VivintSkyApi:
                 }
             ),
         )
+        self.invalidate_cache(panel_id=panel_id)
         if resp is None:
             _LOGGER.debug(
                 "Failed to set state to %s for sensor %s @ %s:%s",
@@ -395,11 +552,13 @@ class VivintSkyApi:
 
         resp = await self.__put(
             f"{panel_id}/{partition_id}/switches/{device_id}",
+            endpoint="set_switch_state",
             headers={
                 "Content-Type": "application/json;charset=utf-8",
             },
-            data=json.dumps(data),
+            data=json_dumps(data),
         )
+        self.invalidate_cache(panel_id=panel_id)
         if resp is None:
             _LOGGER.debug(
                 "Failed to set %s to %s for switch %s @ %s:%s",
@@ -417,11 +576,13 @@ class VivintSkyApi:
         """Set thermostat state."""
         resp = await self.__put(
             f"{panel_id}/{partition_id}/thermostats/{device_id}",
+            endpoint="set_thermostat_state",
             headers={
                 "Content-Type": "application/json;charset=utf-8",
             },
-            data=json.dumps(kwargs),
+            data=json_dumps(kwargs),
         )
+        self.invalidate_cache(panel_id=panel_id)
         if resp is None:
             _LOGGER.debug(
                 "Failed to set state to %s for thermostat %s @ %s:%s",
@@ -439,6 +600,7 @@ class VivintSkyApi:
         try:
             await self.__get(
                 f"{panel_id}/{partition_id}/{device_id}/request-camera-thumbnail",
+                endpoint="request_camera_thumbnail",
             )
         except ClientResponseError as resp:
             if resp.status < 200 or resp.status > 299:
@@ -459,6 +621,7 @@ class VivintSkyApi:
                 f"{panel_id}/{partition_id}/{device_id}/camera-thumbnail",
                 params={"time": thumbnail_timestamp},
                 allow_redirects=False,
+                endpoint="get_camera_thumbnail_url",
             )
             assert resp
             return resp.get("location")
@@ -480,7 +643,9 @@ class VivintSkyApi:
         )
         connector = aiohttp.TCPConnector(enable_cleanup_closed=True, ssl=ssl_context)
 
-        return aiohttp.ClientSession(connector=connector)
+        return aiohttp.ClientSession(
+            connector=connector, trace_configs=[create_trace_config()]
+        )
 
     async def __get_vivintsky_session(self, username: str, password: str) -> None:
         """Perform PKCE oauth login."""
@@ -507,6 +672,7 @@ class VivintSkyApi:
                 "code_challenge_method": "S256",
             },
             allow_redirects=False,
+            endpoint="authorize",
         )
         assert resp
 
@@ -523,7 +689,8 @@ class VivintSkyApi:
             params={
                 "client_id": client_id,
             },
-            data=json.dumps({"username": username, "password": password}),
+            data=json_dumps({"username": username, "password": password}),
+            endpoint="login",
         )
         assert resp
 
@@ -542,7 +709,7 @@ class VivintSkyApi:
             raise VivintSkyApiMfaRequiredError(AuthenticationResponse.MFA_REQUIRED)
 
         assert resp
-        self.__token = resp
+        self.__set_token(resp)
 
     async def __exchange_auth_code(self, auth_code: str) -> None:
         """Exchange an authorization code for an access token."""
@@ -555,9 +722,10 @@ class VivintSkyApi:
                 "code": auth_code,
                 "code_verifier": self.__code_verifier,
             },
+            endpoint="exchange_auth_code",
         )
         assert resp
-        self.__token = resp
+        self.__set_token(resp)
 
     async def __get(
         self,
@@ -565,30 +733,125 @@ class VivintSkyApi:
         headers: dict | None = None,
         params: dict | None = None,
         allow_redirects: bool | None = None,
+        endpoint: str | None = None,
+        panel_id: int | None = None,
     ) -> dict | None:
-        """Perform a get request."""
-        return await self.__call(
+        """Perform a get request, serving from the cache if enabled for `endpoint`."""
+        call = functools.partial(
+            self.__get_coalesced, path, headers, params, allow_redirects, endpoint
+        )
+        cache = self.__cache
+        if not (endpoint and cache is not None and cache.is_cached(endpoint)):
+            return await call()
+
+        key: CacheKey = (
+            endpoint,
+            panel_id,
+            path,
+            tuple(sorted((params or {}).items())),
+        )
+        if (cached := cache.get(key)) is not None:
+            if cached[1] and key not in self.__revalidations:
+                # stale, so refresh it in the background
+                task = asyncio.create_task(self.__revalidate(key, call))
+                self.__revalidations[key] = task
+                task.add_done_callback(lambda _: self.__revalidations.pop(key, None))
+            return cached[0]
+
+        resp: dict | None = await call()
+        if resp is not None:
+            cache.set(key, resp)
+        return resp
+
+    async def __revalidate(
+        self, key: CacheKey, call: Callable[[], Awaitable[dict | None]]
+    ) -> None:
+        """Refresh a stale cache entry in the background."""
+        try:
+            if (resp := await call()) is not None and self.__cache is not None:
+                self.__cache.set(key, resp)
+        except (aiohttp.ClientError, asyncio.TimeoutError, VivintSkyApiError) as err:
+            _LOGGER.debug("Unable to refresh cached %s: %s", key[2], err)
+
+    async def __get_coalesced(
+        self,
+        path: str,
+        headers: dict | None = None,
+        params: dict | None = None,
+        allow_redirects: bool | None = None,
+        endpoint: str | None = None,
+    ) -> dict | None:
+        """Perform a get request, coalescing identical in-flight API requests."""
+        call = functools.partial(
+            self.__call,
             self.__client_session.get,
             path,
             headers=headers,
             params=params,
             allow_redirects=allow_redirects,
+            retries=self.__retry_policy.max_get_retries,
+            endpoint=endpoint,
+        )
+        if AUTH_ENDPOINT in path or _RECONNECTING.get() is self:
+            # a request made by the reconnect mustn't join one waiting on the reconnect
+            return await call()
+
+        key = (
+            path,
+            tuple(sorted((headers or {}).items())),
+            tuple(sorted((params or {}).items())),
+            allow_redirects,
         )
+        if (pending := self.__pending_gets.get(key)) is None:
+            task = asyncio.create_task(call())
+            pending = self.__pending_gets[key] = (task, [0])
+            task.add_done_callback(lambda task: self.__on_get_done(key, task))
+        task, waiters = pending
+        waiters[0] += 1
+        # shield the shared request so a cancelled caller doesn't cancel it for others
+        resp = await asyncio.shield(task)
+        # give each caller its own copy if the response was shared
+        return copy.deepcopy(resp) if waiters[0] > 1 else resp
+
+    def __on_get_done(self, key: tuple, task: asyncio.Task) -> None:
+        """Clear a finished get request."""
+        if not task.cancelled():
+            # mark the exception as retrieved in case every waiter was cancelled
+            task.exception()
+        if (pending := self.__pending_gets.get(key)) and pending[0] is task:
+            del self.__pending_gets[key]
 
     async def __post(
-        self, path: str, data: Any | None = None, params: dict | None = None
+        self,
+        path: str,
+        data: Any | None = None,
+        params: dict | None = None,
+        endpoint: str | None = None,
     ) -> dict | None:
         """Perform a post request."""
         return await self.__call(
-            self.__client_session.post, path, data=data, params=params
+            self.__client_session.post,
+            path,
+            data=data,
+            params=params,
+            endpoint=endpoint,
         )
 
     async def __put(
-        self, path: str, headers: dict | None = None, data: Any | None = None
+        self,
+        path: str,
+        headers: dict | None = None,
+        data: Any | None = None,
+        endpoint: str | None = None,
     ) -> dict | None:
         """Perform a put request."""
         return await self.__call(
-            self.__client_session.put, path, headers=headers, data=data
+            self.__client_session.put,
+            path,
+            headers=headers,
+            data=data,
+            retries=self.__retry_policy.max_put_retries,
+            endpoint=endpoint,
         )
 
     async def __call(
@@ -599,10 +862,15 @@ class VivintSkyApi:
         params: dict | None = None,
         data: Any | None = None,
         allow_redirects: bool | None = None,
+        retries: int = 0,
+        endpoint: str | None = None,
     ) -> dict | None:
-        """Perform a request with supplied parameters and reauthenticate if necessary."""
+        """Perform a request with supplied parameters and reauthenticate if necessary.
+
+        The request is recorded in the stats under `endpoint`, or `path` if not set.
+        """
         if AUTH_ENDPOINT not in path and not self.is_session_valid():
-            await self.connect()
+            await self.__reconnect()
 
         if self.__client_session.closed:
             raise VivintSkyApiError("The client session has been closed")
@@ -617,43 +885,226 @@ class VivintSkyApi:
                 headers = {}
             headers["Authorization"] = f"Bearer {self.__token['access_token']}"
 
-        resp = await method(
-            path
-            if is_mfa_request or AUTH_ENDPOINT in path
-            else f"{API_ENDPOINT}/{path}",
-            headers=headers,
-            params=params,
-            data=data,
-            allow_redirects=allow_redirects,
-        )
-        async with resp:
-            if resp.content_type != "application/json":
-                resp_data = {AuthenticationResponse.MESSAGE: await resp.text()}
+        is_auth_request = is_mfa_request or AUTH_ENDPOINT in path
+        circuit_breaker = self.__circuit_breakers[
+            AUTH_CIRCUIT if is_auth_request else API_CIRCUIT
+        ]
+        label = endpoint or path
+        # the trace config fills in the phase timings
+        trace: dict[str, Any] = {"endpoint": label, "phases": {}}
+        bytes_sent = _body_size(data)
+        started = time.perf_counter()
+        circuit_breaker.acquire()
+        success: bool | None = None
+        try:
+            resp = await self.__send(
+                functools.partial(
+                    method,
+                    path if is_auth_request else f"{API_ENDPOINT}/{path}",
+                    headers=headers,
+                    params=params,
+                    data=data,
+                    allow_redirects=allow_redirects,
+                    trace_request_ctx=trace,
+                ),
+                self.__rate_limits.get(
+                    AUTH_ENDPOINT if is_auth_request else API_ENDPOINT
+                ),
+                retries,
+            )
+            success = resp.status < 500
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+            success = False
+            self.__stats.record(
+                RequestSample(
+                    endpoint=label,
+                    duration=time.perf_counter() - started,
+                    status=type(err).__name__,
+                    error=True,
+                    bytes_sent=bytes_sent,
+                    phases=trace["phases"],
+                )
+            )
+            raise
+        finally:
+            circuit_breaker.release(success)
+        body = b""
+        try:
+            async with resp:
+                body = await resp.read()
+                if resp.content_type != "application/json":
+                    resp_data = {AuthenticationResponse.MESSAGE: await resp.text()}
+                else:
+                    # like aiohttp, treat an empty body as null
+                    resp_data = json_loads(body.strip() or b"null")
+                if resp.status == 200:
+                    return resp_data
+                if resp.status == 302:
+                    return {"location": resp.headers.get("Location")}
+                if resp.status in (400, 401, 403):
+                    message = (
+                        resp_data.get(MfaVerificationResponse.MESSAGE)
+                        if is_mfa_request
+                        else resp_data.get(AuthenticationResponse.MESSAGE)
+                    )
+                    if not message:
+                        message = resp_data.get(AuthenticationResponse.ERROR)
+                        if AuthenticationResponse.ERROR_DESCRIPTION in resp_data:
+                            message = f"{message}: {resp_data[AuthenticationResponse.ERROR_DESCRIPTION]}"
+                    if message == AuthenticationResponse.MFA_REQUIRED or is_mfa_request:
+                        self.__mfa_pending = True
+                        raise VivintSkyApiMfaRequiredError(message)
+                    cls = VivintSkyApiError
+                    if AUTH_ENDPOINT in path:
+                        cls = VivintSkyApiAuthenticationError
+                    raise cls(message)
+                resp.raise_for_status()
+                return None
+        finally:
+            self.__stats.record(
+                RequestSample(
+                    endpoint=label,
+                    duration=time.perf_counter() - started,
+                    status=str(resp.status),
+                    error=resp.status >= 400,
+                    bytes_sent=bytes_sent,
+                    bytes_received=len(body),
+                    phases=trace["phases"],
+                )
+            )
+
+    async def __send(
+        self,
+        request: Callable[[], _RequestContextManager],
+        rate_limit: TokenBucket | None,
+        retries: int,
+    ) -> aiohttp.ClientResponse:
+        """Send a request, honoring the rate limit and retrying up to `retries` times."""
+        policy = self.__retry_policy
+        delay: float | None = None
+        attempt = 0
+        while True:
+            if rate_limit:
+                await rate_limit.acquire()
+            try:
+                resp = await request()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                if attempt >= retries:
+                    raise
+                delay = policy.backoff(delay)
+                _LOGGER.debug("Request failed (%s), retrying in %.1fs", err, delay)
             else:
-                resp_data = await resp.json(encoding="utf-8")
-            if resp.status == 200:
-                return resp_data
-            if resp.status == 302:
-                return {"location": resp.headers.get("Location")}
-            if resp.status in (400, 401, 403):
-                message = (
-                    resp_data.get(MfaVerificationResponse.MESSAGE)
-                    if is_mfa_request
-                    else resp_data.get(AuthenticationResponse.MESSAGE)
+                if resp.status not in policy.retry_statuses:
+                    if rate_limit:
+                        rate_limit.recover()
+                    return resp
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                if rate_limit and resp.status == 429:
+                    rate_limit.throttle(retry_after)
+                if attempt >= retries or (retry_after or 0) > policy.max_delay:
+                    return resp
+                resp.release()
+                delay = policy.backoff(delay) if retry_after is None else retry_after
+                _LOGGER.debug(
+                    "Request returned status %s, retrying in %.1fs", resp.status, delay
                 )
-                if not message:
-                    message = resp_data.get(AuthenticationResponse.ERROR)
-                    if AuthenticationResponse.ERROR_DESCRIPTION in resp_data:
-                        message = f"{message}: {resp_data[AuthenticationResponse.ERROR_DESCRIPTION]}"
-                if message == AuthenticationResponse.MFA_REQUIRED or is_mfa_request:
-                    self.__mfa_pending = True
-                    raise VivintSkyApiMfaRequiredError(message)
-                cls = VivintSkyApiError
-                if AUTH_ENDPOINT in path:
-                    cls = VivintSkyApiAuthenticationError
-                raise cls(message)
-            resp.raise_for_status()
-            return None
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def __set_token(self, token: dict) -> None:
+        """Set the token and cache its expiration."""
+        claims = jwt.decode(token["id_token"], options={"verify_signature": False})
+        self.__token = token
+        if "exp" in claims:
+            self.__token_expiration = float(claims["exp"])
+            # store as a monotonic deadline so validity checks are a float comparison
+            self.__token_deadline = (
+                time.monotonic()
+                + (self.__token_expiration - time.time())
+                - TOKEN_EXPIRATION_LEEWAY
+            )
+        else:
+            self.__token_expiration = None
+            self.__token_deadline = float("inf")
+
+    async def __renew_token(self, margin: float) -> None:
+        """Keep the token fresh by refreshing it ahead of its expiration."""
+        attempt = 0
+        while True:
+            if (expiration := self.__token_expiration) is None:
+                _LOGGER.debug("No token to renew, stopping token renewal")
+                self.__next_token_refresh = None
+                return
+            now = time.time()
+            if (remaining := expiration - now) <= margin:
+                # the margin covers the token's whole lifetime, so don't renew
+                # back-to-back but partway through what is left of it
+                _LOGGER.warning(
+                    "Token refresh margin of %ss exceeds the token's remaining "
+                    "lifetime of %.0fs",
+                    margin,
+                    remaining,
+                )
+                wait = max(remaining / 2, TOKEN_REFRESH_MIN_INTERVAL)
+            else:
+                wait = remaining - margin
+            self.__next_token_refresh = now + wait
+            await asyncio.sleep(wait)
+
+            assert self.__token
+            if not (
+                refresh_token := self.__token.get("refresh_token", self.__refresh_token)
+            ):
+                _LOGGER.debug("No refresh token available, stopping token renewal")
+                self.__next_token_refresh = None
+                return
+            try:
+                await self.refresh_token(refresh_token)
+                attempt = 0
+                _LOGGER.debug("Token renewed in the background")
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                VivintSkyApiError,
+            ) as err:
+                attempt += 1
+                delay = random.uniform(
+                    0,
+                    min(TOKEN_REFRESH_RETRY_MAX, TOKEN_REFRESH_RETRY_BASE * 2**attempt),
+                )
+                _LOGGER.warning(
+                    "Unable to renew token (attempt %s), retrying in %.1f seconds: %s",
+                    attempt,
+                    delay,
+                    err,
+                )
+                self.__next_token_refresh = time.time() + delay
+                await asyncio.sleep(delay)
+
+    async def __reconnect(self) -> None:
+        """Reconnect, sharing a single in-flight attempt between concurrent callers."""
+        if _RECONNECTING.get() is self:
+            # a request made by the reconnect attempt itself, so don't wait on it
+            return
+        task = self.__connect_task
+        if task is None or task.done():
+            task = self.__connect_task = asyncio.create_task(self.__connect_once())
+            task.add_done_callback(self.__on_reconnect_done)
+        # shield the shared attempt so a cancelled caller doesn't cancel it for others
+        await asyncio.shield(task)
+
+    async def __connect_once(self) -> dict:
+        """Connect, marking requests made along the way as part of the reconnect."""
+        _RECONNECTING.set(self)
+        return await self.connect()
+
+    def __on_reconnect_done(self, task: asyncio.Task) -> None:
+        """Clear the finished reconnect attempt."""
+        if not task.cancelled():
+            # mark the exception as retrieved in case every waiter was cancelled
+            task.exception()
+        if self.__connect_task is task:
+            self.__connect_task = None
 
     async def _send_grpc(
         self,
@@ -662,9 +1113,27 @@ class VivintSkyApi:
         """Send gRPC."""
         assert self.is_session_valid()
         assert self.__token
-        creds = grpc.ssl_channel_credentials()
-
-        async with grpc.aio.secure_channel(GRPC_ENDPOINT, credentials=creds) as channel:
-            stub: beam_pb2_grpc.BeamStub = beam_pb2_grpc.BeamStub(channel)  # type: ignore
+        circuit_breaker = self.__circuit_breakers[GRPC_CIRCUIT]
+        circuit_breaker.acquire()
+        success: bool | None = None
+        try:
+            stub = await self.__grpc_channel.get_stub()
             response = await callback(stub, [("token", self.__token["access_token"])])
-            _LOGGER.debug("Response received: %s", str(response))
+            success = True
+        except grpc.aio.AioRpcError as err:
+            success = False if err.code() in GRPC_FAILURE_CODES else None
+            raise
+        finally:
+            circuit_breaker.release(success)
+        _LOGGER.debug("Response received: %s", str(response))
+
+
+def _body_size(data: Any) -> int:
+    """Return the approximate size in bytes of a request body."""
+    if isinstance(data, str):
+        return len(data.encode())
+    if isinstance(data, bytes):
+        return len(data)
+    if isinstance(data, dict):
+        return len(urllib.parse.urlencode(data))
+    return 0
@@ -0,0 +1,98 @@
+"""Module that implements the ResponseCache class."""
+
+from __future__ import annotations
+
+import copy
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+# (endpoint, panel id, path, params)
+CacheKey = tuple[str, "int | None", str, tuple]
+
+
+@dataclass
+class CacheStats:
+    """Describe response cache counters."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class _CacheEntry:
+    """Describe a cached response."""
+
+    value: dict
+    expires_at: float
+    stale_until: float
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of API responses with per-endpoint TTLs.
+
+    Only endpoints listed in `ttls` are cached. Once an entry expires it is still
+    served for `stale_ttl` seconds, flagged as stale, so the caller can refresh it
+    in the background. Values are copied in and out so callers may mutate them.
+    """
+
+    def __init__(
+        self, ttls: Mapping[str, float], max_size: int = 256, stale_ttl: float = 0
+    ) -> None:
+        """Initialize the response cache."""
+        self._ttls = dict(ttls)
+        self._max_size = max_size
+        self._stale_ttl = stale_ttl
+        self._entries: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def is_cached(self, endpoint: str) -> bool:
+        """Return `True` if responses from `endpoint` are cached."""
+        return endpoint in self._ttls
+
+    def get(self, key: CacheKey) -> tuple[dict, bool] | None:
+        """Return a copy of the cached value and whether it is stale, if cached."""
+        if (entry := self._entries.get(key)) is None:
+            self.stats.misses += 1
+            return None
+        now = time.monotonic()
+        if now >= entry.stale_until:
+            del self._entries[key]
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if is_stale := now >= entry.expires_at:
+            self.stats.stale_hits += 1
+        else:
+            self.stats.hits += 1
+        return copy.deepcopy(entry.value), is_stale
+
+    def set(self, key: CacheKey, value: dict) -> None:
+        """Cache a copy of `value`, evicting the least recently used entries."""
+        expires_at = time.monotonic() + self._ttls[key[0]]
+        self._entries[key] = _CacheEntry(
+            copy.deepcopy(value), expires_at, expires_at + self._stale_ttl
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(
+        self, endpoint: str | None = None, panel_id: int | None = None
+    ) -> None:
+        """Remove cached entries for an endpoint and/or panel, or all if neither."""
+        for key in [
+            key
+            for key in self._entries
+            if (endpoint is None or key[0] == endpoint)
+            and (panel_id is None or key[1] == panel_id)
+        ]:
+            del self._entries[key]
@@ -0,0 +1,44 @@
+"""JSON codec used for VivintSky API request and response bodies.
+
+Uses orjson or msgspec when installed (e.g. `pip install vivintpy[speedups]`),
+falling back to the standard library json module.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+json_dumps: Callable[[Any], str]
+json_loads: Callable[[bytes | str], Any]
+
+try:
+    import orjson
+
+    JSON_CODEC = "orjson"
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize `obj` to a JSON formatted string."""
+        return orjson.dumps(obj).decode("utf-8")
+
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+
+        JSON_CODEC = "msgspec"
+
+        _encoder = msgspec.json.Encoder()
+        _decoder = msgspec.json.Decoder()
+
+        def json_dumps(obj: Any) -> str:
+            """Serialize `obj` to a JSON formatted string."""
+            return _encoder.encode(obj).decode("utf-8")
+
+        json_loads = _decoder.decode
+    except ImportError:
+        JSON_CODEC = "json"
+
+        json_dumps = json.dumps
+        json_loads = json.loads
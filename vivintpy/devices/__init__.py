@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import logging
+from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Type, cast
 
 from ..api import VivintSkyApi
+from ..const import AlarmPanelAttribute, SystemAttribute
 from ..const import VivintDeviceAttribute as Attribute
 from ..entity import Entity
 from ..enums import (
@@ -14,12 +17,19 @@ from ..enums import (
     FeatureType,
     ZoneBypass,
 )
+from ..exceptions import VivintStateNotConfirmedError
+from ..utils import first_or_none
 from ..zjs_device_config_db import get_zwave_device_info
 
 if TYPE_CHECKING:
+    from ..dispatch import EventDispatcher
+    from ..supervisor import TaskSupervisor
     from .alarm_panel import AlarmPanel
 
+_LOGGER = logging.getLogger(__name__)
+
 DEVICE = "device"
+DEFAULT_STATE_TIMEOUT = 10
 
 
 def get_device_class(device_type: str) -> Type[VivintDevice]:
@@ -83,6 +93,16 @@ class VivintDevice(Entity):
         assert self.alarm_panel, """no alarm panel set for this device"""
         return self.alarm_panel.system.api
 
+    @property
+    def dispatcher(self) -> EventDispatcher | None:
+        """Return the dispatcher that delivers events, if any."""
+        return self.alarm_panel.dispatcher if self.alarm_panel else None
+
+    @property
+    def supervisor(self) -> TaskSupervisor:
+        """Return the supervisor that runs background tasks."""
+        return self.alarm_panel.supervisor if self.alarm_panel else super().supervisor
+
     @property
     def id(self) -> int:  # pylint: disable=invalid-name
         """Device's id."""
@@ -187,6 +207,58 @@ class VivintDevice(Entity):
             else None
         )
 
+    async def wait_valid(self, timeout: float | None = None) -> bool:
+        """Wait until the device is valid, returning False if it times out."""
+        return await self.wait_for(lambda: self.is_valid, timeout)
+
+    async def refresh_data(self) -> None:
+        """Reload the device's data from the VivintSky API."""
+        assert self.alarm_panel, """no alarm panel set for this device"""
+        resp = await self.api.get_device_data(self.alarm_panel.id, self.id)
+        device_data = first_or_none(
+            resp[SystemAttribute.SYSTEM][SystemAttribute.PARTITION][0][
+                AlarmPanelAttribute.DEVICES
+            ],
+            lambda data: data[Attribute.ID] == self.id,
+        )
+        if device_data:
+            self.update_data(device_data)
+
+    async def confirm_state(
+        self,
+        predicate: Callable[[], bool],
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+    ) -> None:
+        """Wait for an update to satisfy `predicate`, else reload the device's data.
+
+        Raise `VivintStateNotConfirmedError` if the state still doesn't match.
+        """
+        if await self.wait_for(predicate, timeout):
+            return
+        _LOGGER.debug("%s - no state update received, reloading data", self.name)
+        await self.refresh_data()
+        if not predicate():
+            raise VivintStateNotConfirmedError(
+                f"{self.name} did not reach the requested state"
+            )
+
+    async def send_optimistically(
+        self,
+        command: Awaitable[None],
+        changes: dict,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+    ) -> None:
+        """Apply `changes` right away and send `command`, rolling them back if it fails.
+
+        The changes are also rolled back unless confirmed within `timeout` seconds.
+        """
+        rollback = self.update_data_optimistically(changes, timeout)
+        try:
+            await command
+        except Exception:
+            rollback()
+            raise
+
     def get_zwave_details(self) -> None:
         """Get Z-Wave details."""
         if self.data.get("zpd") is None:
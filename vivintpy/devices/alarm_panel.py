@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import TYPE_CHECKING, Type
 
@@ -16,10 +15,12 @@ from ..const import (
 )
 from ..enums import ArmedState, DeviceType
 from ..exceptions import VivintSkyApiError
-from ..utils import add_async_job, first_or_none
-from . import VivintDevice, get_device_class
+from ..utils import first_or_none
+from . import DEFAULT_STATE_TIMEOUT, VivintDevice, get_device_class
 
 if TYPE_CHECKING:
+    from ..dispatch import EventDispatcher
+    from ..supervisor import TaskSupervisor
     from ..system import System
 
 _LOGGER = logging.getLogger(__name__)
@@ -27,16 +28,37 @@ _LOGGER = logging.getLogger(__name__)
 DEVICE_DELETED = "device_deleted"
 DEVICE_DISCOVERED = "device_discovered"
 
+# how long a new device has to become valid before it is no longer waited on
+NEW_DEVICE_TIMEOUT = 300
+
+# states that confirm a requested armed state
+CONFIRMED_STATES = {
+    ArmedState.ARMED_AWAY: {
+        ArmedState.ARMING_AWAY_IN_EXIT_DELAY,
+        ArmedState.ARMED_AWAY,
+    },
+    ArmedState.ARMED_STAY: {
+        ArmedState.ARMING_STAY_IN_EXIT_DELAY,
+        ArmedState.ARMED_STAY,
+    },
+}
+
 
 class AlarmPanel(VivintDevice):
     """Describe a Vivint alarm panel."""
 
+    PRIORITY_ATTRIBUTES = frozenset({Attribute.STATE})
+
     def __init__(self, data: dict, system: System):
         """Initialize an alarm panel."""
         self.system = system
         super().__init__(data)
         self.devices: list[VivintDevice] = []
         self.unregistered_devices: dict[int, tuple] = {}
+        # indexes by device id of the device objects and of the raw device data
+        self.__device_index: dict[int, VivintDevice] = {}
+        self.__raw_device_index: dict[int, dict] = {}
+        self.__index_raw_devices(self.data[Attribute.DEVICES])
 
         self.__parse_data(data=data, init=True)
 
@@ -58,6 +80,16 @@ class AlarmPanel(VivintDevice):
         """Return the API."""
         return self.system.api
 
+    @property
+    def dispatcher(self) -> EventDispatcher | None:
+        """Return the dispatcher that delivers events, if any."""
+        return self.system.dispatcher
+
+    @property
+    def supervisor(self) -> TaskSupervisor:
+        """Return the supervisor that runs background tasks."""
+        return self.system.supervisor
+
     @property
     def id(self) -> int:
         """Panel's id."""
@@ -122,27 +154,41 @@ class AlarmPanel(VivintDevice):
         """Return the panel credentials."""
         return self.__panel_credentials
 
-    async def set_armed_state(self, state: int) -> None:
-        """Set the armed state for a panel."""
+    async def set_armed_state(
+        self,
+        state: int,
+        wait_for_state: bool = False,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+    ) -> None:
+        """Set the armed state for a panel, optionally waiting for confirmation."""
         _LOGGER.debug("Setting %s to %s", self.name, ArmedState(state).name)
         await self.api.set_alarm_state(self.id, self.partition_id, state)
+        if wait_for_state:
+            states = CONFIRMED_STATES.get(ArmedState(state), {state})
+            await self.confirm_state(lambda: self.state in states, timeout)
 
     async def trigger_alarm(self) -> None:
         """Trigger an alarm."""
         _LOGGER.debug("Triggering an alarm on %s", self.name)
         await self.api.trigger_alarm(self.id, self.partition_id)
 
-    async def disarm(self) -> None:
+    async def disarm(
+        self, wait_for_state: bool = False, timeout: float = DEFAULT_STATE_TIMEOUT
+    ) -> None:
         """Disarm the alarm."""
-        await self.set_armed_state(ArmedState.DISARMED)
+        await self.set_armed_state(ArmedState.DISARMED, wait_for_state, timeout)
 
-    async def arm_stay(self) -> None:
+    async def arm_stay(
+        self, wait_for_state: bool = False, timeout: float = DEFAULT_STATE_TIMEOUT
+    ) -> None:
         """Set the alarm to armed stay."""
-        await self.set_armed_state(ArmedState.ARMED_STAY)
+        await self.set_armed_state(ArmedState.ARMED_STAY, wait_for_state, timeout)
 
-    async def arm_away(self) -> None:
+    async def arm_away(
+        self, wait_for_state: bool = False, timeout: float = DEFAULT_STATE_TIMEOUT
+    ) -> None:
         """Set the alarm to armed away."""
-        await self.set_armed_state(ArmedState.ARMED_AWAY)
+        await self.set_armed_state(ArmedState.ARMED_AWAY, wait_for_state, timeout)
 
     async def get_panel_credentials(self, refresh: bool = False) -> dict:
         """Get the panel credentials."""
@@ -192,6 +238,10 @@ class AlarmPanel(VivintDevice):
             return
         await self.api.reboot_panel(self.id)
 
+    def get_device(self, device_id: int) -> VivintDevice | None:
+        """Get an associated device by id."""
+        return self.__device_index.get(device_id)
+
     def get_devices(
         self, device_types: set[Type[VivintDevice]] | None = None
     ) -> list[VivintDevice]:
@@ -207,14 +257,41 @@ class AlarmPanel(VivintDevice):
 
         return devices
 
+    async def refresh_data(self) -> None:
+        """Reload the alarm panel's data from the VivintSky API."""
+        system_data = await self.api.get_system_data(self.id)
+        panel_data = first_or_none(
+            system_data[SystemAttribute.SYSTEM][SystemAttribute.PARTITION],
+            lambda data: data[Attribute.PARTITION_ID] == self.partition_id,
+        )
+        if panel_data:
+            self.refresh(panel_data)
+
     def refresh(self, data: dict, new_device: bool = False) -> None:
-        """Refresh the alarm panel."""
+        """Refresh the alarm panel.
+
+        Only devices whose data changed are updated. Unless `new_device` is set,
+        `data` is the full panel data, so devices missing from it are deleted.
+        """
         if not new_device:
             self.update_data(data, override=True)
         else:
             self.data[Attribute.DEVICES].extend(data[Attribute.DEVICES])
+            self.__index_raw_devices(data[Attribute.DEVICES])
 
-        self.__parse_data(data)
+        self.__parse_data(data, discover=not new_device)
+
+        if not new_device:
+            device_ids = set(self.__raw_device_index)
+            for device in [d for d in self.devices if d.id not in device_ids]:
+                self.__remove_device(device)
+
+    def update_data(self, new_val: dict, override: bool = False) -> None:
+        """Update the alarm panel's raw data, re-indexing the raw device data."""
+        if override or Attribute.DEVICES in new_val:
+            self.__raw_device_index.clear()
+            self.__index_raw_devices(new_val.get(Attribute.DEVICES, []))
+        super().update_data(new_val, override)
 
     def handle_pubnub_message(self, message: dict) -> None:
         """Handle a pubnub message."""
@@ -244,12 +321,13 @@ class AlarmPanel(VivintDevice):
 
                 if operation == PubNubOperatorAttribute.CREATE:
                     self.refresh(data=data, new_device=True)
-                    add_async_job(self.handle_new_device, device_id)
-                else:
-                    device = first_or_none(
-                        self.devices,
-                        lambda device, device_id=device_id: device.id == device_id,  # type: ignore
+                    # wait for the device without holding a background task slot
+                    self.system.supervisor.create_task(
+                        self.handle_new_device(device_id),
+                        ready=self.__wait_new_device(device_id),
                     )
+                else:
+                    device = self.__device_index.get(device_id)
                     if not device:
                         _LOGGER.debug(
                             "Ignoring message for device %s (device not found)",
@@ -258,23 +336,15 @@ class AlarmPanel(VivintDevice):
                         continue
 
                     # for the sake of consistency, we also need to update the panel's raw data
-                    raw_device_data = first_or_none(
-                        self.data[Attribute.DEVICES],
-                        lambda raw_device_data,  # type: ignore
-                        device_data=device_data: (
-                            raw_device_data["_id"] == device_data["_id"]
-                        ),
-                    )
+                    raw_device_data = self.__raw_device_index.get(device_id)
 
                     if operation == PubNubOperatorAttribute.DELETE:
-                        self.devices.remove(device)
                         if raw_device_data is not None:
                             self.data[Attribute.DEVICES].remove(raw_device_data)
-                        self.unregistered_devices[device.id] = (
-                            device.name,
-                            device.device_type,
-                        )
-                        self.emit(DEVICE_DELETED, {"device": device})
+                            del self.__raw_device_index[device_id]
+                            # index any duplicate raw data left from a new device
+                            self.__index_raw_devices(self.data[Attribute.DEVICES])
+                        self.__remove_device(device)
                     else:
                         device.handle_pubnub_message(device_data)
                         assert raw_device_data
@@ -283,12 +353,9 @@ class AlarmPanel(VivintDevice):
     async def handle_new_device(self, device_id: int) -> None:
         """Handle a new device."""
         try:
-            device = first_or_none(self.devices, lambda device: device.id == device_id)
-            assert device
-            while not device.is_valid:
-                await asyncio.sleep(1)
-                if device.id in self.unregistered_devices:
-                    return
+            if not await self.__wait_new_device(device_id):
+                return
+            device = self.__device_index[device_id]
             resp = await self.api.get_device_data(self.id, device_id)
             data = resp[SystemAttribute.SYSTEM][SystemAttribute.PARTITION][0]
             self.refresh(data, new_device=True)
@@ -296,21 +363,37 @@ class AlarmPanel(VivintDevice):
         except VivintSkyApiError:
             _LOGGER.error("Error getting new device data for device %s", device_id)
 
-    def __parse_data(self, data: dict, init: bool = False) -> None:
+    async def __wait_new_device(self, device_id: int) -> bool:
+        """Wait for a new device to become valid, returning False if it doesn't.
+
+        The wait ends early if the device is deleted or unregistered.
+        """
+        if (
+            device := self.__device_index.get(device_id)
+        ) is None or device_id in self.unregistered_devices:
+            return False
+        if await device.wait_for(
+            lambda: device.is_valid or device_id in self.unregistered_devices,
+            NEW_DEVICE_TIMEOUT,
+        ):
+            return device_id not in self.unregistered_devices
+        _LOGGER.debug("New device %s did not become valid", device_id)
+        return False
+
+    def __parse_data(
+        self, data: dict, init: bool = False, discover: bool = False
+    ) -> None:
         """Parse the alarm panel data."""
         for device_data in data[Attribute.DEVICES]:
             device: VivintDevice | None = None
             if not init:
-                device = first_or_none(
-                    self.devices,
-                    lambda device, device_data=device_data: (  # type: ignore
-                        device.id == device_data[Attribute.ID]
-                    ),
-                )
+                device = self.__device_index.get(device_data[Attribute.ID])
             if device:
                 device.update_data(device_data, override=True)
             else:
-                self.__parse_device_data(device_data=device_data)
+                device = self.__parse_device_data(device_data=device_data)
+                if discover:
+                    self.emit(DEVICE_DISCOVERED, {"device": device})
 
         if data.get(Attribute.UNREGISTERED):
             self.unregistered_devices = {
@@ -320,9 +403,29 @@ class AlarmPanel(VivintDevice):
                 )
                 for device in data[Attribute.UNREGISTERED]
             }
+            for device_id in self.unregistered_devices:
+                if unregistered_device := self.__device_index.get(device_id):
+                    unregistered_device.cancel_waiters()
 
-    def __parse_device_data(self, device_data: dict) -> None:
-        """Parse device data and optionally emit a device discovered event."""
+    def __parse_device_data(self, device_data: dict) -> VivintDevice:
+        """Parse device data and add the device."""
         device_class = get_device_class(device_data[Attribute.TYPE])
         device = device_class(device_data, self)
         self.devices.append(device)
+        self.__device_index[device.id] = device
+        return device
+
+    def __remove_device(self, device: VivintDevice) -> None:
+        """Remove a device and emit a device deleted event."""
+        self.devices.remove(device)
+        del self.__device_index[device.id]
+        self.unregistered_devices[device.id] = (device.name, device.device_type)
+        device.cancel_waiters()
+        self.emit(DEVICE_DELETED, {"device": device})
+
+    def __index_raw_devices(self, raw_devices: list[dict]) -> None:
+        """Index raw device data by id, keeping the first entry for an id."""
+        for raw_device_data in raw_devices:
+            self.__raw_device_index.setdefault(
+                raw_device_data[Attribute.ID], raw_device_data
+            )
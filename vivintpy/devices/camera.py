@@ -75,6 +75,8 @@ class RtspUrlType(IntEnum):
 class Camera(VivintDevice):
     """Represents a Vivint camera."""
 
+    PRIORITY_ATTRIBUTES = frozenset({Attribute.DING_DONG})
+
     alarm_panel: AlarmPanel
 
     def __init__(self, data: dict, alarm_panel: AlarmPanel):
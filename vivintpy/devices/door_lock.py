@@ -6,7 +6,7 @@ from typing import cast
 
 from ..const import LockAttribute
 from ..const import ZWaveDeviceAttribute as Attribute
-from . import BypassTamperDevice
+from . import DEFAULT_STATE_TIMEOUT, BypassTamperDevice
 
 
 class DoorLock(BypassTamperDevice):
@@ -27,17 +27,43 @@ class DoorLock(BypassTamperDevice):
         """Return the user code list."""
         return cast(list[int], self.data.get(LockAttribute.USER_CODE_LIST, []))
 
-    async def set_state(self, locked: bool) -> None:
-        """Set door lock's state."""
+    async def set_state(
+        self,
+        locked: bool,
+        wait_for_state: bool = False,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+        optimistic: bool = False,
+    ) -> None:
+        """Set door lock's state, optionally waiting for it to be confirmed.
+
+        If `optimistic`, the state is updated right away instead (see
+        `send_optimistically`), unless waiting for it to be confirmed.
+        """
         assert self.alarm_panel
-        await self.api.set_lock_state(
+        command = self.api.set_lock_state(
             self.alarm_panel.id, self.alarm_panel.partition_id, self.id, locked
         )
+        if optimistic and not wait_for_state:
+            await self.send_optimistically(command, {Attribute.STATE: locked}, timeout)
+        else:
+            await command
+        if wait_for_state:
+            await self.confirm_state(lambda: self.is_locked == locked, timeout)
 
-    async def lock(self) -> None:
+    async def lock(
+        self,
+        wait_for_state: bool = False,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+        optimistic: bool = False,
+    ) -> None:
         """Lock the door lock."""
-        await self.set_state(True)
+        await self.set_state(True, wait_for_state, timeout, optimistic)
 
-    async def unlock(self) -> None:
+    async def unlock(
+        self,
+        wait_for_state: bool = False,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+        optimistic: bool = False,
+    ) -> None:
         """Unlock the door lock."""
-        await self.set_state(False)
+        await self.set_state(False, wait_for_state, timeout, optimistic)
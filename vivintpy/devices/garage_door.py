@@ -6,7 +6,13 @@ from typing import Any
 
 from ..const import ZWaveDeviceAttribute as Attribute
 from ..enums import GarageDoorState
-from . import VivintDevice
+from . import DEFAULT_STATE_TIMEOUT, VivintDevice
+
+# states that confirm a requested state
+CONFIRMED_STATES = {
+    GarageDoorState.CLOSING: {GarageDoorState.CLOSING, GarageDoorState.CLOSED},
+    GarageDoorState.OPENING: {GarageDoorState.OPENING, GarageDoorState.OPENED},
+}
 
 
 class GarageDoor(VivintDevice):
@@ -43,17 +49,29 @@ class GarageDoor(VivintDevice):
         """Return the garage door's state."""
         return self.data[Attribute.STATE]
 
-    async def set_state(self, state: int) -> None:
-        """Set garage door's state."""
+    async def set_state(
+        self,
+        state: int,
+        wait_for_state: bool = False,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+    ) -> None:
+        """Set garage door's state, optionally waiting for it to be confirmed."""
         assert self.alarm_panel
         await self.api.set_garage_door_state(
             self.alarm_panel.id, self.alarm_panel.partition_id, self.id, state
         )
+        if wait_for_state:
+            states = CONFIRMED_STATES.get(GarageDoorState(state), {state})
+            await self.confirm_state(lambda: self.state in states, timeout)
 
-    async def close(self) -> None:
+    async def close(
+        self, wait_for_state: bool = False, timeout: float = DEFAULT_STATE_TIMEOUT
+    ) -> None:
         """Close the garage door."""
-        await self.set_state(GarageDoorState.CLOSING)
+        await self.set_state(GarageDoorState.CLOSING, wait_for_state, timeout)
 
-    async def open(self) -> None:
+    async def open(
+        self, wait_for_state: bool = False, timeout: float = DEFAULT_STATE_TIMEOUT
+    ) -> None:
         """Open the garage door."""
-        await self.set_state(GarageDoorState.OPENING)
+        await self.set_state(GarageDoorState.OPENING, wait_for_state, timeout)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from ..const import SwitchAttribute as Attribute
-from . import VivintDevice
+from . import DEFAULT_STATE_TIMEOUT, VivintDevice
 
 
 class Switch(VivintDevice):
@@ -28,20 +28,62 @@ class Switch(VivintDevice):
         self,
         on: bool | None = None,  # pylint: disable=invalid-name
         level: int | None = None,
+        wait_for_state: bool = False,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+        optimistic: bool = False,
     ) -> None:
-        """Set switch's state."""
+        """Set switch's state, optionally waiting for it to be confirmed.
+
+        If `optimistic`, the state is updated right away instead (see
+        `send_optimistically`), unless waiting for it to be confirmed.
+        """
         assert self.alarm_panel
-        await self.api.set_switch_state(
+        command = self.api.set_switch_state(
             self.alarm_panel.id, self.alarm_panel.partition_id, self.id, on, level
         )
+        if optimistic and not wait_for_state:
+            changes = (
+                {Attribute.STATE: on} if level is None else {Attribute.VALUE: level}
+            )
+            await self.send_optimistically(command, changes, timeout)
+        else:
+            await command
+        if wait_for_state:
+            await self.confirm_state(
+                lambda: (
+                    (on is None or self.is_on == on)
+                    and (level is None or self.level == level)
+                ),
+                timeout,
+            )
 
-    async def turn_on(self) -> None:
+    async def turn_on(
+        self,
+        wait_for_state: bool = False,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+        optimistic: bool = False,
+    ) -> None:
         """Turn on the switch."""
-        await self.set_state(on=True)
+        await self.set_state(
+            on=True,
+            wait_for_state=wait_for_state,
+            timeout=timeout,
+            optimistic=optimistic,
+        )
 
-    async def turn_off(self) -> None:
+    async def turn_off(
+        self,
+        wait_for_state: bool = False,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+        optimistic: bool = False,
+    ) -> None:
         """Turn off the switch."""
-        await self.set_state(on=False)
+        await self.set_state(
+            on=False,
+            wait_for_state=wait_for_state,
+            timeout=timeout,
+            optimistic=optimistic,
+        )
 
 
 class BinarySwitch(Switch):
@@ -51,6 +93,17 @@ class BinarySwitch(Switch):
 class MultilevelSwitch(Switch):
     """Represents a Vivint multilevel switch device."""
 
-    async def set_level(self, level: int) -> None:
+    async def set_level(
+        self,
+        level: int,
+        wait_for_state: bool = False,
+        timeout: float = DEFAULT_STATE_TIMEOUT,
+        optimistic: bool = False,
+    ) -> None:
         """Set the level of the switch between 0..100."""
-        await self.set_state(level=level)
+        await self.set_state(
+            level=level,
+            wait_for_state=wait_for_state,
+            timeout=timeout,
+            optimistic=optimistic,
+        )
@@ -88,9 +88,16 @@ class Thermostat(VivintDevice):
         """Convert Celsius to Fahrenheit."""
         return round(celsius * 1.8 + 32)
 
-    async def set_state(self, **kwargs: Any) -> None:
-        """Set the state of the thermostat."""
+    async def set_state(self, optimistic: bool = False, **kwargs: Any) -> None:
+        """Set the state of the thermostat.
+
+        If `optimistic`, the state is updated right away (see `send_optimistically`).
+        """
         assert self.alarm_panel
-        await self.api.set_thermostat_state(
+        command = self.api.set_thermostat_state(
             self.alarm_panel.id, self.alarm_panel.partition_id, self.id, **kwargs
         )
+        if optimistic:
+            await self.send_optimistically(command, kwargs)
+        else:
+            await command
@@ -0,0 +1,245 @@
+"""Deliver entity events to listeners through a bounded queue."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import inspect
+import itertools
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from enum import Enum
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 1000
+DEFAULT_WORKERS = 4
+
+
+class BackpressurePolicy(Enum):
+    """What to do with a new event when the dispatch queue is full."""
+
+    # the emitter runs the listener itself, slowing the producer down, though the
+    # awaitable a coroutine listener returns is queued in place of the oldest call
+    BLOCK = "block"
+    # the oldest queued listener call is dropped
+    DROP_OLDEST = "drop_oldest"
+    # queued calls for the same entity, event and listener are merged into one
+    COALESCE = "coalesce"
+
+
+@dataclass
+class DispatchStats:
+    """Describe listener call counters."""
+
+    dispatched: int = 0
+    failed: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    inline: int = 0
+
+
+@dataclass
+class _ListenerCall:
+    """A queued listener call."""
+
+    event_name: str
+    listener: Callable
+    data: dict
+    awaitable: Awaitable | None = None
+
+
+class EventDispatcher:
+    """Deliver events to listeners from worker tasks.
+
+    Listeners may be plain functions or coroutine functions. Up to `max_size`
+    listener calls are queued and `workers` calls run at once, so a slow listener
+    doesn't hold up message handling or other listeners. Calls are delivered in
+    order, but with more than one worker they may complete out of order. Without
+    a running event loop, listeners are called immediately.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        workers: int = DEFAULT_WORKERS,
+        policy: BackpressurePolicy = BackpressurePolicy.BLOCK,
+    ) -> None:
+        """Initialize the dispatcher."""
+        self.max_size = max_size
+        self.policy = policy
+        self._worker_count = workers
+        self._queue: OrderedDict[Hashable, _ListenerCall] = OrderedDict()
+        self._sequence = itertools.count()
+        self._stats = DispatchStats()
+        self._workers: list[asyncio.Task] = []
+        self._not_empty = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._active = 0
+        self._subscribers: list[Callable[[object, str, dict], None]] = []
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued listener calls."""
+        return len(self._queue)
+
+    @property
+    def stats(self) -> DispatchStats:
+        """Return a copy of the listener call counters."""
+        return dataclasses.replace(self._stats)
+
+    def subscribe(
+        self, subscriber: Callable[[object, str, dict], None]
+    ) -> Callable[[], None]:
+        """Register a callback for every published event, returning an unsubscribe."""
+        self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+        return unsubscribe
+
+    def publish(self, emitter: object, event_name: str, data: dict) -> None:
+        """Pass an event to the subscribers."""
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(emitter, event_name, data)
+            except Exception:  # pylint: disable=broad-except
+                self._stats.failed += 1
+                _LOGGER.exception("Error in %s event subscriber", event_name)
+
+    def submit(
+        self, emitter: object, event_name: str, listener: Callable, data: dict
+    ) -> None:
+        """Queue a listener call for an event."""
+        if not self._workers and not self.__start():
+            self.__call_inline(_ListenerCall(event_name, listener, data))
+            return
+
+        if self.policy is BackpressurePolicy.COALESCE:
+            key: Hashable = (id(emitter), event_name, listener)
+            if (pending := self._queue.get(key)) is not None:
+                pending.data = _merge_event_data(pending.data, data)
+                self._stats.coalesced += 1
+                return
+        else:
+            key = next(self._sequence)
+
+        call = _ListenerCall(event_name, listener, data)
+        if len(self._queue) >= self.max_size:
+            if self.policy is BackpressurePolicy.BLOCK:
+                self._stats.inline += 1
+                self.__call_inline(call)
+                return
+            self.__drop_oldest()
+
+        self._queue[key] = call
+        self._idle.clear()
+        self._not_empty.set()
+
+    async def join(self) -> None:
+        """Wait until all queued listener calls are done."""
+        await self._idle.wait()
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """Stop the workers, waiting up to `timeout` seconds for queued calls."""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.warning(
+                "Dropping %s event listener call(s) on stop", len(self._queue)
+            )
+            while self._queue:
+                self.__drop_oldest()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._active = 0
+        self._idle.set()
+
+    def __start(self) -> bool:
+        """Start the workers if there is a running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._workers = [
+            loop.create_task(self.__work()) for _ in range(self._worker_count)
+        ]
+        return True
+
+    async def __work(self) -> None:
+        """Run queued listener calls."""
+        while True:
+            while not self._queue:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+            _, call = self._queue.popitem(last=False)
+            self._active += 1
+            try:
+                if call.awaitable is None:
+                    result = call.listener(call.data)
+                    if inspect.isawaitable(result):
+                        await result
+                else:
+                    await call.awaitable
+                self._stats.dispatched += 1
+            except Exception:  # pylint: disable=broad-except
+                self._stats.failed += 1
+                _LOGGER.exception("Error in %s event listener", call.event_name)
+            finally:
+                self._active -= 1
+                if not self._queue and not self._active:
+                    self._idle.set()
+
+    def __drop_oldest(self) -> None:
+        """Drop the oldest queued listener call."""
+        _, call = self._queue.popitem(last=False)
+        if inspect.iscoroutine(call.awaitable):
+            call.awaitable.close()
+        self._stats.dropped += 1
+
+    def __call_inline(self, call: _ListenerCall) -> None:
+        """Call a listener from the emitter, queueing the result if awaitable."""
+        try:
+            result = call.listener(call.data)
+        except Exception:  # pylint: disable=broad-except
+            self._stats.failed += 1
+            _LOGGER.exception("Error in %s event listener", call.event_name)
+            return
+        if inspect.isawaitable(result) and self._workers:
+            # a worker awaits it, so it still counts against the queue's limit
+            if len(self._queue) >= self.max_size:
+                self.__drop_oldest()
+            call.awaitable = result
+            self._queue[next(self._sequence)] = call
+            self._idle.clear()
+            self._not_empty.set()
+        elif inspect.isawaitable(result):
+            _LOGGER.warning(
+                "Unable to await %s event listener without a running event loop",
+                call.event_name,
+            )
+            if inspect.iscoroutine(result):
+                result.close()
+        else:
+            self._stats.dispatched += 1
+
+
+def _merge_event_data(pending: dict, data: dict) -> dict:
+    """Merge the data of two events, combining the changes of update events."""
+    if "changed" in pending and "changed" in data:
+        return {
+            **pending,
+            **data,
+            "data": {**pending["data"], **data["data"]},
+            "changed": pending["changed"] | data["changed"],
+        }
+    return data
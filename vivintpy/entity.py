@@ -1,56 +1,280 @@
-"""Module that implements the Entity class."""
+"""Module that implements the EventEmitter and Entity classes."""
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import asyncio
+import inspect
+import logging
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from .supervisor import TaskSupervisor
+
+if TYPE_CHECKING:
+    from .dispatch import EventDispatcher
+
+_LOGGER = logging.getLogger(__name__)
 
 UPDATE = "update"
 
 
-class Entity:
-    """Describe a Vivint entity."""
+class EventEmitter:
+    """Describe an object that emits events to registered listeners."""
+
+    __own_supervisor: TaskSupervisor | None = None
+
+    def __init__(self) -> None:
+        """Initialize an event emitter."""
+        self._listeners: dict[str, list[Callable]] = {}
+
+    def on(  # pylint: disable=invalid-name
+        self, event_name: str, callback: Callable
+    ) -> Callable:
+        """Register an event callback."""
+        listeners: list = self._listeners.setdefault(event_name, [])
+        listeners.append(callback)
+
+        def unsubscribe() -> None:
+            """Unsubscribe listeners."""
+            if callback in listeners:
+                listeners.remove(callback)
+
+        return unsubscribe
+
+    @property
+    def dispatcher(self) -> EventDispatcher | None:
+        """Return the dispatcher that delivers events, if any."""
+        return None
+
+    @property
+    def supervisor(self) -> TaskSupervisor:
+        """Return the supervisor that runs background tasks, created on first use."""
+        if self.__own_supervisor is None:
+            self.__own_supervisor = TaskSupervisor()
+        return self.__own_supervisor
+
+    def emit(self, event_name: str, data: dict) -> None:
+        """Run all callbacks for an event.
+
+        Callbacks go through the dispatcher, if any, otherwise they are called
+        immediately and coroutine callbacks are run by the supervisor.
+        """
+        dispatcher = self.dispatcher
+        if dispatcher is not None:
+            dispatcher.publish(self, event_name, data)
+        for listener in list(self._listeners.get(event_name, [])):
+            if dispatcher is not None:
+                dispatcher.submit(self, event_name, listener, data)
+                continue
+            try:
+                if inspect.iscoroutine(result := listener(data)):
+                    self.supervisor.create_task(result)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in %s event listener", event_name)
+
+
+class Entity(EventEmitter):
+    """Describe a Vivint entity.
+
+    If `update_window` is set to a number of seconds, the updates made within
+    that window are emitted as a single merged UPDATE event at its end, while the
+    data itself is updated immediately. Updates changing one of the
+    `PRIORITY_ATTRIBUTES`, and any other event, are emitted right away after the
+    pending update.
+
+    Values set by `update_data_optimistically` are emitted right away in an
+    UPDATE flagged `optimistic`, and any later update of those keys confirms
+    them. Unconfirmed values that are rolled back are emitted in an UPDATE
+    flagged `rollback`.
+    """
+
+    PRIORITY_ATTRIBUTES: frozenset[str] = frozenset()
 
     def __init__(self, data: dict):
         """Initialize an entity."""
+        super().__init__()
         self.__data = data
-        self._listeners: dict[str, list[Callable]] = {}
+        self.update_window: float | None = None
+        self.__pending_update: dict | None = None
+        self.__flush_handle: asyncio.TimerHandle | None = None
+        self.__waiters: list[tuple[Callable[[], bool], asyncio.Future[bool]]] = []
+        # previous value and optimistic update of each unconfirmed key
+        self.__unconfirmed: dict[str, tuple[Any, object]] = {}
+        self.__update_flag: str | None = None
 
     @property
     def data(self) -> dict:
         """Return entity's raw data as returned by VivintSky API."""
         return self.__data
 
+    def on(  # pylint: disable=invalid-name
+        self,
+        event_name: str,
+        callback: Callable,
+        attrs: Iterable[str] | None = None,
+    ) -> Callable:
+        """Register an event callback.
+
+        If `attrs` is set, the callback only runs for events whose `changed` keys
+        include at least one of them, e.g. `on(UPDATE, callback, attrs={"s"})`.
+        """
+        if attrs is None:
+            return super().on(event_name, callback)
+        attrs = frozenset(attrs)
+
+        def filtered_callback(data: dict) -> Any:
+            if not attrs.isdisjoint(data.get("changed", ())):
+                return callback(data)
+            return None
+
+        return super().on(event_name, filtered_callback)
+
     def update_data(self, new_val: dict, override: bool = False) -> None:
-        """Update entity's raw data."""
+        """Update entity's raw data, emitting an update if any value changed."""
+        if self.__unconfirmed and self.__update_flag is None:
+            for key in new_val:
+                self.__unconfirmed.pop(key, None)
+
+        old_val = self.__data
+        changed = {
+            key
+            for key, value in new_val.items()
+            if key not in old_val or old_val[key] != value
+        }
         if override:
+            changed.update(old_val.keys() - new_val.keys())
             self.__data = new_val
         else:
             self.__data.update(new_val)
 
-        self.emit(UPDATE, {"data": new_val})
+        if changed:
+            if self.__waiters:
+                self.__check_waiters()
+            self.__queue_update(new_val, changed)
 
-    def handle_pubnub_message(self, message: dict) -> None:
-        """Handle a pubnub message directed to this entity."""
-        self.update_data(message)
+    def update_data_optimistically(
+        self, new_val: dict, timeout: float | None = None
+    ) -> Callable[[], None]:
+        """Update entity's raw data ahead of its confirmation by the API.
 
-    def on(  # pylint: disable=invalid-name
-        self, event_name: str, callback: Callable
-    ) -> Callable:
-        """Register an event callback."""
-        listeners: list = self._listeners.setdefault(event_name, [])
-        listeners.append(callback)
+        Unless updated again within `timeout` seconds, the values are rolled back.
+        Return a function that rolls back the values if they are still unconfirmed.
+        """
+        token = object()
+        for key in new_val:
+            previous = (
+                self.__unconfirmed[key][0]
+                if key in self.__unconfirmed
+                else self.__data.get(key)
+            )
+            self.__unconfirmed[key] = (previous, token)
+        self.__update_with_flag(new_val, "optimistic")
 
-        def unsubscribe() -> None:
-            """Unsubscribe listeners."""
-            if callback in listeners:
-                listeners.remove(callback)
+        def rollback() -> None:
+            keys = [key for key, (_, t) in self.__unconfirmed.items() if t is token]
+            if keys:
+                _LOGGER.debug("Rolling back unconfirmed values of %s", keys)
+                self.__update_with_flag(
+                    {key: self.__unconfirmed.pop(key)[0] for key in keys}, "rollback"
+                )
 
-        return unsubscribe
+        if timeout is not None:
+            try:
+                asyncio.get_running_loop().call_later(timeout, rollback)
+            except RuntimeError:
+                pass
+        return rollback
+
+    async def wait_for(
+        self, predicate: Callable[[], bool], timeout: float | None = None
+    ) -> bool:
+        """Wait until `predicate` returns True, checking it whenever data changes.
+
+        Return False if it doesn't within `timeout` seconds or the wait is cancelled
+        by `cancel_waiters`.
+        """
+        if predicate():
+            return True
+        waiter = (predicate, asyncio.get_running_loop().create_future())
+        self.__waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter[1], timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if waiter in self.__waiters:
+                self.__waiters.remove(waiter)
+
+    def cancel_waiters(self) -> None:
+        """End all pending `wait_for` calls, which then return False."""
+        waiters, self.__waiters = self.__waiters, []
+        for _, future in waiters:
+            if not future.done():
+                future.set_result(False)
 
     def emit(self, event_name: str, data: dict) -> None:
-        """Run all callbacks for an event."""
-        for listener in self._listeners.get(event_name, []):
+        """Run all callbacks for an event, after emitting any pending update."""
+        if event_name != UPDATE:
+            self.flush_update()
+        super().emit(event_name, data)
+
+    def flush_update(self) -> None:
+        """Emit the pending update now, if any."""
+        if self.__flush_handle is not None:
+            self.__flush_handle.cancel()
+            self.__flush_handle = None
+        if (pending := self.__pending_update) is not None:
+            # cleared first, so a flush from within the emit is a no-op
+            self.__pending_update = None
+            self.emit(UPDATE, pending)
+
+    def __check_waiters(self) -> None:
+        """Resolve the waiters whose predicate is now met."""
+        for waiter in list(self.__waiters):
+            predicate, future = waiter
+            if future.done():
+                continue
             try:
-                listener(data)
-            except:  # noqa E722 # pylint: disable=bare-except
+                if predicate():
+                    future.set_result(True)
+            except Exception as err:  # noqa: BLE001 # pylint: disable=broad-except
+                future.set_exception(err)
+
+    def __update_with_flag(self, new_val: dict, flag: str) -> None:
+        """Update entity's raw data, emitting the update right away with a flag."""
+        self.flush_update()
+        self.__update_flag = flag
+        try:
+            self.update_data(new_val)
+        finally:
+            self.__update_flag = None
+
+    def __queue_update(self, new_val: dict, changed: set[str]) -> None:
+        """Merge an update into the pending one, emitting it unless in a window."""
+        if (pending := self.__pending_update) is not None:
+            new_val = {**pending["data"], **new_val}
+            changed |= pending["changed"]
+        self.__pending_update = {"data": new_val, "changed": frozenset(changed)}
+        if self.__update_flag:
+            self.__pending_update[self.__update_flag] = True
+
+        if (
+            self.update_window
+            and not self.__update_flag
+            and self.PRIORITY_ATTRIBUTES.isdisjoint(changed)
+        ):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
                 pass
+            else:
+                if self.__flush_handle is None:
+                    self.__flush_handle = loop.call_later(
+                        self.update_window, self.flush_update
+                    )
+                return
+        self.flush_update()
+
+    def handle_pubnub_message(self, message: dict) -> None:
+        """Handle a pubnub message directed to this entity."""
+        self.update_data(message)
@@ -149,6 +149,15 @@ class CapabilityType(IntEnum):
         return cls.UNKNOWN
 
 
+@unique
+class CircuitState(Enum):
+    """Circuit breaker state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
 # @unique
 class DeviceType(Enum):
     """Device type."""
@@ -5,6 +5,10 @@ class VivintError(Exception):
     """General vivintpy exception occurred."""
 
 
+class VivintStateNotConfirmedError(VivintError):
+    """Requested state change of a device was not confirmed."""
+
+
 class VivintSkyApiError(VivintError):
     """VivintSky API related exception occurred."""
 
@@ -17,6 +21,10 @@ class VivintSkyApiMfaRequiredError(VivintSkyApiAuthenticationError):
     """VivintSky API MFA required related error occurred."""
 
 
+class VivintSkyApiCircuitOpenError(VivintSkyApiError):
+    """VivintSky API endpoint is failing fast while its circuit is open."""
+
+
 class VivintSkyApiExpiredCookieError(VivintSkyApiError):
     """VivintSky API cookie expired error occurred."""
 
@@ -0,0 +1,93 @@
+"""Module that implements the GrpcChannelManager class."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Sequence
+
+import grpc
+
+from .proto import beam_pb2_grpc
+
+_LOGGER = logging.getLogger(__name__)
+
+# servers answer pings more frequent than every 5 minutes, or any made without an
+# active call, with a GOAWAY, so only ping during calls and no more often than that
+DEFAULT_CHANNEL_OPTIONS: list[tuple[str, int]] = [
+    ("grpc.keepalive_time_ms", 300_000),
+    ("grpc.keepalive_timeout_ms", 20_000),
+]
+
+
+class GrpcChannelManager:
+    """Manage a long-lived, shared gRPC channel to the Vivint Beam service.
+
+    The channel is opened lazily on first use and re-opened if it enters the
+    `TRANSIENT_FAILURE` or `SHUTDOWN` state. Concurrent callers share the same
+    channel (and stub), so HTTP/2 multiplexes their calls over one connection.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        options: list[tuple[str, int]] | None = None,
+        interceptors: Sequence[grpc.aio.ClientInterceptor] | None = None,
+    ) -> None:
+        """Initialize the channel manager."""
+        self._target = target
+        self._options = DEFAULT_CHANNEL_OPTIONS if options is None else options
+        self._interceptors = interceptors
+        self._credentials: grpc.ChannelCredentials | None = None
+        self._channel: grpc.aio.Channel | None = None
+        self._stub: beam_pb2_grpc.BeamStub | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Return `True` if a channel is currently open."""
+        return self._channel is not None
+
+    async def get_stub(self) -> beam_pb2_grpc.BeamStub:
+        """Return a Beam stub bound to the shared channel, opening it if needed."""
+        if self._stub is not None and self.__is_healthy():
+            return self._stub
+
+        async with self._lock:
+            if self._channel is not None and not self.__is_healthy():
+                _LOGGER.debug("Reconnecting gRPC channel to %s", self._target)
+                await self.__close_channel()
+            if self._channel is None or self._stub is None:
+                _LOGGER.debug("Opening gRPC channel to %s", self._target)
+                if self._credentials is None:
+                    self._credentials = grpc.ssl_channel_credentials()
+                self._channel = grpc.aio.secure_channel(
+                    self._target,
+                    credentials=self._credentials,
+                    options=self._options,
+                    interceptors=self._interceptors,
+                )
+                self._stub = beam_pb2_grpc.BeamStub(self._channel)  # type: ignore
+            return self._stub
+
+    async def close(self) -> None:
+        """Close the shared channel, if open."""
+        async with self._lock:
+            await self.__close_channel()
+
+    def __is_healthy(self) -> bool:
+        """Return `True` if the channel is open and not in a failed state."""
+        if self._channel is None:
+            return False
+        state = self._channel.get_state()
+        return state not in (
+            grpc.ChannelConnectivity.TRANSIENT_FAILURE,
+            grpc.ChannelConnectivity.SHUTDOWN,
+        )
+
+    async def __close_channel(self) -> None:
+        """Close the channel without acquiring the lock."""
+        channel, self._channel, self._stub = self._channel, None, None
+        if channel is not None:
+            _LOGGER.debug("Closing gRPC channel to %s", self._target)
+            await channel.close()
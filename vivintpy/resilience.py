@@ -0,0 +1,182 @@
+"""Rate limiting, retry and circuit breaker helpers for the VivintSky API."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from .enums import CircuitState
+from .exceptions import VivintSkyApiCircuitOpenError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class RetryPolicy:
+    """Describe when and how requests are retried.
+
+    Gets are idempotent and retried up to `max_get_retries` times, puts only up to
+    `max_put_retries` times. Delays use decorrelated jitter between `base_delay`
+    and `max_delay`, unless the server supplies a `Retry-After` header.
+    """
+
+    max_get_retries: int = 3
+    max_put_retries: int = 0
+    base_delay: float = 0.5
+    max_delay: float = 30
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    def backoff(self, previous_delay: float | None) -> float:
+        """Return the next delay using decorrelated jitter."""
+        if previous_delay is None:
+            previous_delay = self.base_delay
+        return min(self.max_delay, random.uniform(self.base_delay, previous_delay * 3))
+
+
+class TokenBucket:
+    """Adaptive token bucket rate limiter.
+
+    Requests acquire a token before being sent; tokens refill at `rate` per second
+    up to `capacity`. When throttled, the rate is halved (down to `min_rate`) and
+    requests are paused for any `Retry-After` period. Each success then restores
+    the rate a tenth of the way back to its configured value.
+    """
+
+    def __init__(
+        self, rate: float, capacity: float | None = None, min_rate: float | None = None
+    ) -> None:
+        """Initialize the token bucket."""
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = rate / 10 if min_rate is None else min_rate
+        self.capacity = rate if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        """Slow down after the server throttled a request."""
+        self.rate = max(self.min_rate, self.rate / 2)
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def recover(self) -> None:
+        """Speed back up after a successful request."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class CircuitBreaker:
+    """Fail fast while an endpoint family is unhealthy.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are
+    rejected with `VivintSkyApiCircuitOpenError`. Once `recovery_timeout` seconds
+    have passed the circuit is half-open and lets up to `half_open_max_calls`
+    probes through: a successful probe closes the circuit, a failed one reopens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30,
+        half_open_max_calls: int = 1,
+        on_state_change: Callable[[str, CircuitState, CircuitState], None]
+        | None = None,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the circuit state."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self.__set_state(CircuitState.HALF_OPEN)
+        return self._state
+
+    def acquire(self) -> None:
+        """Allow a call through or raise if the circuit is open."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return
+        if state == CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return
+        raise VivintSkyApiCircuitOpenError(f"The {self.name} circuit is open")
+
+    def release(self, success: bool | None) -> None:
+        """Record the outcome of an allowed call, `None` if inconclusive."""
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+        if success:
+            self._failures = 0
+            if self._state != CircuitState.CLOSED:
+                self.__set_state(CircuitState.CLOSED)
+        elif success is False:
+            self._failures += 1
+            if self._state == CircuitState.HALF_OPEN or (
+                self._state == CircuitState.CLOSED
+                and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self.__set_state(CircuitState.OPEN)
+
+    def __set_state(self, state: CircuitState) -> None:
+        """Transition to a new state and notify."""
+        previous, self._state = self._state, state
+        self._probes = 0
+        _LOGGER.debug("%s circuit changed from %s to %s", self.name, previous, state)
+        if self.on_state_change:
+            self.on_state_change(self.name, previous, state)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a `Retry-After` header value into a delay in seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
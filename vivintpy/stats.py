@@ -0,0 +1,243 @@
+"""Request latency and error instrumentation for the VivintSky API."""
+
+from __future__ import annotations
+
+import copy
+import logging
+import math
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+import grpc
+from google.protobuf.message import Message
+
+_LOGGER = logging.getLogger(__name__)
+
+# bucket bounds grow by 5%, so percentiles are within ~5% of the recorded value
+HISTOGRAM_MIN_VALUE = 0.0001
+HISTOGRAM_GROWTH = 1.05
+_LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+
+PHASE_QUEUED = "queued"
+PHASE_DNS = "dns"
+PHASE_CONNECT = "connect"
+PHASE_TTFB = "ttfb"
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in seconds with bounded memory."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self._buckets: Counter[int] = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Return the mean duration."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def p50(self) -> float:
+        """Return the median duration."""
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        """Return the 95th percentile duration."""
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> float:
+        """Return the 99th percentile duration."""
+        return self.percentile(99)
+
+    def record(self, value: float) -> None:
+        """Record a duration."""
+        index = (
+            math.ceil(math.log(value / HISTOGRAM_MIN_VALUE) / _LOG_GROWTH)
+            if value > HISTOGRAM_MIN_VALUE
+            else 0
+        )
+        self._buckets[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """Return the duration below which `percent` of the recorded ones fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self.max, HISTOGRAM_MIN_VALUE * HISTOGRAM_GROWTH**index)
+        return self.max
+
+
+@dataclass(frozen=True)
+class RequestSample:
+    """Describe a single instrumented request."""
+
+    endpoint: str
+    duration: float
+    status: str
+    error: bool
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    phases: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class EndpointStats:
+    """Describe request counters and latencies for an endpoint."""
+
+    count: int = 0
+    errors: int = 0
+    statuses: Counter[str] = field(default_factory=Counter)
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    phases: dict[str, LatencyHistogram] = field(default_factory=dict)
+
+
+class RequestStats:
+    """Aggregate request samples into per-endpoint statistics.
+
+    Endpoints are labelled by `VivintSkyApi` method name for REST requests and by
+    RPC name (e.g. `SetCameraPrivacyMode`) for gRPC calls. Each sample is also
+    passed to `on_sample`, if set, so it can be forwarded to a metrics system.
+    """
+
+    def __init__(self, on_sample: Callable[[RequestSample], None] | None = None):
+        """Initialize the request stats."""
+        self.on_sample = on_sample
+        self._endpoints: dict[str, EndpointStats] = {}
+
+    def record(self, sample: RequestSample) -> None:
+        """Record a request sample."""
+        if (stats := self._endpoints.get(sample.endpoint)) is None:
+            stats = self._endpoints[sample.endpoint] = EndpointStats()
+        stats.count += 1
+        stats.errors += sample.error
+        stats.statuses[sample.status] += 1
+        stats.bytes_sent += sample.bytes_sent
+        stats.bytes_received += sample.bytes_received
+        stats.latency.record(sample.duration)
+        for phase, duration in sample.phases.items():
+            if (histogram := stats.phases.get(phase)) is None:
+                histogram = stats.phases[phase] = LatencyHistogram()
+            histogram.record(duration)
+        if self.on_sample:
+            try:
+                self.on_sample(sample)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in request stats callback")
+
+    def snapshot(self) -> dict[str, EndpointStats]:
+        """Return a copy of the statistics by endpoint."""
+        return copy.deepcopy(self._endpoints)
+
+    def reset(self) -> None:
+        """Clear the statistics."""
+        self._endpoints.clear()
+
+    def grpc_interceptor(self) -> grpc.aio.UnaryUnaryClientInterceptor:
+        """Return a gRPC interceptor that records unary calls."""
+        return _GrpcStatsInterceptor(self)
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Return an aiohttp trace config that times the phases of a request.
+
+    The queued, DNS, connect (TCP and TLS) and time-to-first-byte durations are
+    stored in the `phases` dict of the request's `trace_request_ctx`, if any. Add
+    it to a custom client session to get phase timings from `VivintSkyApi`.
+    """
+    trace_config = aiohttp.TraceConfig()
+
+    def _start(name: str) -> Callable[..., Any]:
+        async def _on_start(
+            session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+        ) -> None:
+            setattr(context, name, time.perf_counter())
+
+        return _on_start
+
+    def _end(name: str, started: str = "") -> Callable[..., Any]:
+        async def _on_end(
+            session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+        ) -> None:
+            request = context.trace_request_ctx
+            start = getattr(context, started or name, None)
+            if isinstance(request, dict) and "phases" in request and start:
+                request["phases"][name] = time.perf_counter() - start
+
+        return _on_end
+
+    trace_config.on_request_start.append(_start("request"))
+    trace_config.on_connection_queued_start.append(_start(PHASE_QUEUED))
+    trace_config.on_connection_queued_end.append(_end(PHASE_QUEUED))
+    trace_config.on_dns_resolvehost_start.append(_start(PHASE_DNS))
+    trace_config.on_dns_resolvehost_end.append(_end(PHASE_DNS))
+    trace_config.on_connection_create_start.append(_start(PHASE_CONNECT))
+    trace_config.on_connection_create_end.append(_end(PHASE_CONNECT))
+    trace_config.on_request_end.append(_end(PHASE_TTFB, "request"))
+    return trace_config
+
+
+class _GrpcStatsInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    """Record the latency, status and size of unary gRPC calls."""
+
+    def __init__(self, stats: RequestStats) -> None:
+        """Initialize the interceptor."""
+        self._stats = stats
+
+    async def intercept_unary_unary(
+        self,
+        continuation: Callable[[grpc.aio.ClientCallDetails, Any], Any],
+        client_call_details: grpc.aio.ClientCallDetails,
+        request: Any,
+    ) -> Any:
+        """Time the call and record it."""
+        method = client_call_details.method
+        if isinstance(method, bytes):
+            method = method.decode()
+        bytes_sent = request.ByteSize() if isinstance(request, Message) else 0
+        started = time.perf_counter()
+        try:
+            call = await continuation(client_call_details, request)
+            response = await call
+        except grpc.aio.AioRpcError as err:
+            self._stats.record(
+                RequestSample(
+                    endpoint=method.rsplit("/", 1)[-1],
+                    duration=time.perf_counter() - started,
+                    status=err.code().name,
+                    error=True,
+                    bytes_sent=bytes_sent,
+                )
+            )
+            raise
+        self._stats.record(
+            RequestSample(
+                endpoint=method.rsplit("/", 1)[-1],
+                duration=time.perf_counter() - started,
+                status=grpc.StatusCode.OK.name,
+                error=False,
+                bytes_sent=bytes_sent,
+                bytes_received=response.ByteSize()
+                if isinstance(response, Message)
+                else 0,
+            )
+        )
+        return call
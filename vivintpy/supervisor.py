@@ -0,0 +1,127 @@
+"""Run and keep track of background tasks."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+from .stats import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_TASKS = 16
+
+
+@dataclass
+class TaskStats:
+    """Describe background task counters and durations."""
+
+    started: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    # time spent waiting for a free slot and then running
+    wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class TaskSupervisor:
+    """Run background tasks, at most `max_concurrency` at a time.
+
+    Tasks are referenced until they are done, so they can't be garbage collected
+    mid-flight, and `shutdown` waits for or cancels those still running.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENT_TASKS) -> None:
+        """Initialize the task supervisor."""
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self._stats = TaskStats()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of tasks that are waiting or running."""
+        return len(self._tasks)
+
+    @property
+    def stats(self) -> TaskStats:
+        """Return a copy of the task stats."""
+        return copy.deepcopy(self._stats)
+
+    def create_task(
+        self,
+        target: Callable | Coroutine,
+        *args: Any,
+        name: str | None = None,
+        ready: Awaitable[bool] | None = None,
+    ) -> asyncio.Task:
+        """Run a coroutine, coroutine function or function in the background.
+
+        If set, `ready` is awaited before waiting for a slot, and the task is
+        skipped if it returns False, so waiting on it doesn't hold up other tasks.
+        """
+        loop = asyncio.get_running_loop()
+        if asyncio.iscoroutine(target):
+            coro = target
+        elif asyncio.iscoroutinefunction(target):
+            coro = target(*args)
+        else:
+            coro = _run_in_executor(loop, target, *args)
+        task = loop.create_task(self.__run(coro, ready), name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self._stats.started += 1
+        return task
+
+    async def shutdown(self, timeout: float | None = None) -> None:
+        """Wait up to `timeout` seconds for the tasks to finish, then cancel them."""
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        if pending:
+            _LOGGER.debug("Cancelling %s background task(s)", len(pending))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def __run(self, coro: Coroutine, ready: Awaitable[bool] | None) -> Any:
+        """Run a coroutine once ready and a slot is free, recording its outcome."""
+        try:
+            if ready is not None and not await ready:
+                coro.close()
+                self._stats.completed += 1
+                return None
+            queued = time.perf_counter()
+            async with self._semaphore:
+                started = time.perf_counter()
+                self._stats.wait.record(started - queued)
+                try:
+                    result = await coro
+                finally:
+                    self._stats.latency.record(time.perf_counter() - started)
+        except asyncio.CancelledError:
+            self._stats.cancelled += 1
+            # close the coroutines if cancelled before they started
+            coro.close()
+            if inspect.iscoroutine(ready):
+                ready.close()
+            raise
+        except Exception:  # pylint: disable=broad-except
+            self._stats.failed += 1
+            _LOGGER.exception("Error in background task")
+            return None
+        self._stats.completed += 1
+        return result
+
+
+async def _run_in_executor(
+    loop: asyncio.AbstractEventLoop, func: Callable, *args: Any
+) -> Any:
+    """Run a function in the default executor."""
+    return await loop.run_in_executor(None, func, *args)
@@ -3,25 +3,41 @@
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
 
 from .api import VivintSkyApi
 from .const import PubNubMessageAttribute
 from .const import SystemAttribute as Attribute
 from .devices.alarm_panel import AlarmPanel
 from .entity import Entity
+from .supervisor import TaskSupervisor
 from .user import User
 from .utils import first_or_none
 
+if TYPE_CHECKING:
+    from .dispatch import EventDispatcher
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class System(Entity):
     """Describe a vivint system."""
 
-    def __init__(self, data: dict, api: VivintSkyApi, *, name: str, is_admin: bool):
+    def __init__(
+        self,
+        data: dict,
+        api: VivintSkyApi,
+        *,
+        name: str,
+        is_admin: bool,
+        dispatcher: EventDispatcher | None = None,
+        supervisor: TaskSupervisor | None = None,
+    ):
         """Initialize a system."""
         super().__init__(data)
         self._api = api
+        self._dispatcher = dispatcher
+        self._supervisor = supervisor or TaskSupervisor()
         self._name = name
         self._is_admin = is_admin
         self.alarm_panels: list[AlarmPanel] = [
@@ -38,6 +54,16 @@ class System(Entity):
         """Return the API."""
         return self._api
 
+    @property
+    def dispatcher(self) -> EventDispatcher | None:
+        """Return the dispatcher that delivers events, if any."""
+        return self._dispatcher
+
+    @property
+    def supervisor(self) -> TaskSupervisor:
+        """Return the supervisor that runs background tasks."""
+        return self._supervisor
+
     @property
     def id(self) -> int:  # pylint: disable=invalid-name
         """System's id."""
@@ -56,14 +82,13 @@ class System(Entity):
     async def refresh(self) -> None:
         """Reload a system's data from the VivintSky API."""
         system_data = await self.api.get_system_data(self.id)
+        alarm_panels = {
+            (panel.id, panel.partition_id): panel for panel in self.alarm_panels
+        }
 
         for panel_data in system_data[Attribute.SYSTEM][Attribute.PARTITION]:
-            alarm_panel = first_or_none(
-                self.alarm_panels,
-                lambda panel, panel_data=panel_data: (  # type: ignore
-                    panel.id == panel_data[Attribute.PANEL_ID]
-                    and panel.partition_id == panel_data[Attribute.PARTITION_ID]
-                ),
+            alarm_panel = alarm_panels.get(
+                (panel_data[Attribute.PANEL_ID], panel_data[Attribute.PARTITION_ID])
             )
             if alarm_panel:
                 alarm_panel.refresh(panel_data)
@@ -8,6 +8,8 @@ from .const import UserAttribute as Attribute
 from .entity import Entity
 
 if TYPE_CHECKING:
+    from .dispatch import EventDispatcher
+    from .supervisor import TaskSupervisor
     from .system import System
 
 ADD_LOCK = f"{Attribute.LOCK_IDS}.1"
@@ -25,6 +27,21 @@ class User(Entity):
         """Return custom __repr__ of user."""
         return f"<{self.__class__.__name__} {self.id}, {self.name}{' (admin)' if self.is_admin else ''}>"
 
+    @property
+    def dispatcher(self) -> EventDispatcher | None:
+        """Return the dispatcher that delivers events, if any."""
+        return self._system.dispatcher
+
+    @property
+    def supervisor(self) -> TaskSupervisor:
+        """Return the supervisor that runs background tasks."""
+        return self._system.supervisor
+
+    @property
+    def system(self) -> System:
+        """Return the system the user belongs to."""
+        return self._system
+
     @property
     def has_lock_pin(self) -> bool:
         """Return True if the user has pins."""
@@ -25,7 +25,11 @@ def first_or_none(lst: Iterable[_T], predicate: Callable[[_T], Any]) -> _T | Non
 def add_async_job(
     target: Callable | Coroutine, *args: Any
 ) -> asyncio.Task | asyncio.Future:
-    """Add a callable to the event loop."""
+    """Add a callable to the event loop.
+
+    Deprecated: the task isn't tracked, use `TaskSupervisor.create_task` instead.
+    """
+    send_deprecation_warning("add_async_job", "TaskSupervisor.create_task")
     loop = asyncio.get_event_loop()
     task: asyncio.Future | asyncio.Task
 
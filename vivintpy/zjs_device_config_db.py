@@ -1,23 +1,197 @@
-"""Script to generate Z-Wave device data."""
+"""Lookup Z-Wave device data from the Z-Wave JS device config database.
+
+The database is read from a compact, prebuilt binary index (see
+`build_device_index`) that is memory-mapped on the first lookup, so importing this
+module is cheap and only the pages that are searched are loaded.
+"""
 
 from __future__ import annotations
 
+import functools
 import json
+import logging
+import mmap
 import os
-from typing import Final
+import struct
+import threading
+from collections.abc import Mapping
+from typing import Any, Final
+
+_LOGGER = logging.getLogger(__name__)
+
+ZJS_DEVICE_CONFIG_DB_FILE: Final = os.path.join(
+    os.path.dirname(__file__), "zjs_device_config_db.json"
+)
+ZJS_DEVICE_INDEX_FILE: Final = os.path.join(
+    os.path.dirname(__file__), "zjs_device_config_db.bin"
+)
+UPDATED_AT: Final = "updated_at"
+
+DEVICE_INFO_FIELDS: Final = ("manufacturer", "label", "description")
+ZWAVE_LOOKUP_CACHE_SIZE: Final = 1024
+
+# magic, version, record count, string count, updated at string index
+_HEADER = struct.Struct("<4sHxxIII")
+_KEY = struct.Struct("<Q")
+_RECORD = struct.Struct(f"<{len(DEVICE_INFO_FIELDS)}I")
+_OFFSET = struct.Struct("<I")
+_MAGIC = b"ZJSD"
+_VERSION = 1
+_NO_STRING = 0xFFFFFFFF
+# set on a string index if the value is JSON encoded (e.g. a conditional label)
+_JSON_FLAG = 0x80000000
+
+_index: _DeviceIndex | None = None
+_index_lock = threading.Lock()
+
+
+def pack_zwave_key(manufacturer_id: int, product_type: int, product_id: int) -> int:
+    """Pack a manufacturer id, product type and product id into a single integer."""
+    return (manufacturer_id << 32) | (product_type << 16) | product_id
+
+
+def build_device_index(device_db: Mapping[str, Any]) -> bytes:
+    """Build the binary index from a `"0x%04x:0x%04x:0x%04x"` keyed device db.
+
+    The index is a header, the sorted packed keys, one record of string indexes
+    per key and a table of the deduplicated UTF-8 strings they point to.
+    """
+    strings: dict[str, int] = {}
+
+    def _string_index(value: Any) -> int:
+        flag = 0
+        if not isinstance(value, str):
+            value, flag = json.dumps(value, sort_keys=True), _JSON_FLAG
+        return strings.setdefault(value, len(strings)) | flag
+
+    records: dict[int, tuple[int, ...]] = {}
+    for key, device_info in device_db.items():
+        if key == UPDATED_AT or not isinstance(device_info, dict):
+            continue
+        try:
+            manufacturer_id, product_type, product_id = (
+                int(part, 16) for part in key.split(":")
+            )
+        except ValueError:
+            _LOGGER.debug("Skipping invalid Z-Wave device key %s", key)
+            continue
+        records[pack_zwave_key(manufacturer_id, product_type, product_id)] = tuple(
+            _string_index(device_info[field]) if field in device_info else _NO_STRING
+            for field in DEVICE_INFO_FIELDS
+        )
+
+    updated_at = device_db.get(UPDATED_AT)
+    updated_at_index = (
+        _string_index(updated_at) if isinstance(updated_at, str) else _NO_STRING
+    )
+
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+
+    keys = sorted(records)
+    return b"".join(
+        (
+            _HEADER.pack(_MAGIC, _VERSION, len(keys), len(encoded), updated_at_index),
+            *(_KEY.pack(key) for key in keys),
+            *(_RECORD.pack(*records[key]) for key in keys),
+            *(_OFFSET.pack(offset) for offset in offsets),
+            *encoded,
+        )
+    )
+
+
+class _DeviceIndex:
+    """Binary search a device index held in a buffer."""
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        """Initialize the device index."""
+        magic, version, count, string_count, updated_at = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Unsupported Z-Wave device index")
+        self._buffer = buffer
+        self._count = count
+        self._records = _HEADER.size + count * _KEY.size
+        self._offsets = self._records + count * _RECORD.size
+        self._strings = self._offsets + (string_count + 1) * _OFFSET.size
+        self.updated_at = self._string(updated_at)
+
+    def get(self, key: int) -> dict[str, Any] | None:
+        """Return the device info for a packed key, if found."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            (found,) = _KEY.unpack_from(self._buffer, _HEADER.size + middle * _KEY.size)
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                indexes = _RECORD.unpack_from(
+                    self._buffer, self._records + middle * _RECORD.size
+                )
+                return {
+                    field: self._string(index)
+                    for field, index in zip(DEVICE_INFO_FIELDS, indexes)
+                    if index != _NO_STRING
+                }
+        return None
+
+    def _string(self, index: int) -> Any:
+        """Return the string (or JSON encoded value) at the index."""
+        if index == _NO_STRING:
+            return None
+        position = (index & ~_JSON_FLAG) * _OFFSET.size + self._offsets
+        (start,) = _OFFSET.unpack_from(self._buffer, position)
+        (end,) = _OFFSET.unpack_from(self._buffer, position + _OFFSET.size)
+        value = self._buffer[self._strings + start : self._strings + end].decode()
+        return json.loads(value) if index & _JSON_FLAG else value
+
+
+def _load_index() -> _DeviceIndex:
+    """Memory-map the device index, building it from the JSON db if missing."""
+    global _index  # pylint: disable=global-statement
+    with _index_lock:
+        if _index is None:
+            try:
+                with open(ZJS_DEVICE_INDEX_FILE, "rb") as file:
+                    _index = _DeviceIndex(
+                        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    )
+            except (OSError, ValueError) as err:
+                _LOGGER.debug("Building Z-Wave device index from JSON: %s", err)
+                _index = _DeviceIndex(build_device_index(_load_json_db()))
+        return _index
+
+
+def _load_json_db() -> dict[str, str | dict[str, str]]:
+    """Load the full JSON device db."""
+    with open(ZJS_DEVICE_CONFIG_DB_FILE, encoding="utf8") as file:
+        data: dict[str, str | dict[str, str]] = json.load(file)
+    return data
+
+
+def __getattr__(name: str) -> Any:
+    """Load the full `ZJS_DEVICE_DB` on first access, for backwards compatibility."""
+    if name == "ZJS_DEVICE_DB":
+        globals()[name] = _load_json_db()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-with open(
-    os.path.join(os.path.dirname(__file__), "zjs_device_config_db.json"),
-    encoding="utf8",
-) as file:
-    ZJS_DEVICE_DB: Final[dict[str, str | dict[str, str]]] = json.load(file)
+@functools.lru_cache(maxsize=ZWAVE_LOOKUP_CACHE_SIZE)
+def _lookup(key: int) -> dict[str, Any] | None:
+    """Return the device info for a packed key, remembering hits and misses."""
+    return _load_index().get(key)
 
 
 def get_zwave_device_info(
     manufacturer_id: int | None, product_type: int | None, product_id: int | None
 ) -> dict[str, str]:
     """Lookup the Z-Wave device based on the manufacturer id, product type and product id."""
-    key = f"0x{manufacturer_id:04x}:0x{product_type:04x}:0x{product_id:04x}"
-    if isinstance((device_info := ZJS_DEVICE_DB.get(key)), dict):
-        return device_info
-    return {}
+    if manufacturer_id is None or product_type is None or product_id is None:
+        return {}
+    device_info = _lookup(pack_zwave_key(manufacturer_id, product_type, product_id))
+    # copy so callers can't change the memoized result
+    return dict(device_info) if device_info else {}